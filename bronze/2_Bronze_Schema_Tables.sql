@@ -142,8 +142,10 @@ CREATE TABLE IF NOT EXISTS file_processing_queue (
     queue_id NUMBER AUTOINCREMENT,
     file_name VARCHAR,                          -- Filename only (no path)
     file_type VARCHAR,                          -- 'CSV' or 'EXCEL'
+    tpa VARCHAR,                                -- TPA folder the file was uploaded to (NULL for legacy root files)
     status VARCHAR,                             -- PENDING, PROCESSING, SUCCESS, FAILED
     process_result VARCHAR,                     -- Result message from processing procedure
+    rows_processed NUMBER,                      -- Rows processed (parsed from process_result on SUCCESS)
     discovered_timestamp TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
     processed_timestamp TIMESTAMP_NTZ,          -- When processing completed
     moved_timestamp TIMESTAMP_NTZ,              -- When file was moved to completed/error
@@ -151,6 +153,23 @@ CREATE TABLE IF NOT EXISTS file_processing_queue (
     PRIMARY KEY (queue_id)
 );
 
+-- Add rows_processed to queues created before the column existed and backfill it
+ALTER TABLE file_processing_queue ADD COLUMN IF NOT EXISTS rows_processed NUMBER;
+
+UPDATE file_processing_queue
+SET rows_processed = TRY_TO_NUMBER(REGEXP_SUBSTR(process_result, '[0-9]+'))
+WHERE rows_processed IS NULL
+  AND status = 'SUCCESS'
+  AND process_result LIKE '%rows%';
+
+-- Add tpa to queues created before the column existed and backfill it from the file path
+ALTER TABLE file_processing_queue ADD COLUMN IF NOT EXISTS tpa VARCHAR;
+
+UPDATE file_processing_queue
+SET tpa = SPLIT_PART(file_name, '/', -2)
+WHERE tpa IS NULL
+  AND CONTAINS(file_name, '/');
+
 -- ============================================
 -- REPROCESS QUEUE TABLE
 -- ============================================
@@ -192,7 +211,7 @@ $$
 # ============================================
 # Process Flow:
 #   1. List stage files and get metadata
-#   2. Read CSV file using pandas
+#   2. Read CSV file using pandas (plain or gzip-compressed)
 #   3. Convert each row to JSON
 #   4. Create temporary staging table
 #   5. MERGE into RAW_DATA_TABLE (dedup on FILE_NAME + FILE_ROW_NUMBER)
@@ -253,12 +272,14 @@ def process_csv(session: Session, source_stage_name: str, file_name: str):
         else:
             full_stage_path = f"{stage_path}/{file_name}"
         
-        # Read CSV file from stage
-        with SnowflakeFile.open(full_stage_path, 'r', require_scoped_url=False) as f:
+        # Read CSV file from stage (binary mode so gzip-compressed uploads can be read too)
+        with SnowflakeFile.open(full_stage_path, 'rb', require_scoped_url=False) as f:
             file_content = f.read()
         
         # Parse CSV with pandas
-        csv_df = pd.read_csv(io.StringIO(file_content))
+        # Files uploaded through the Streamlit app are gzip-compressed by PUT (file.csv.gz)
+        compression = 'gzip' if file_name.lower().endswith('.gz') else None
+        csv_df = pd.read_csv(io.BytesIO(file_content), compression=compression)
         
         if csv_df.empty:
             return "FAILURE: File is empty"
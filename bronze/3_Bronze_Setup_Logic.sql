@@ -31,7 +31,7 @@ USE SCHEMA IDENTIFIER($SCHEMA_NAME);
 -- Called by: discover_files_task
 --
 -- Features:
---   - Detects both CSV and Excel files
+--   - Detects both CSV (plain or .csv.gz) and Excel files
 --   - Deduplicates: Skips files already in queue with PENDING/PROCESSING/SUCCESS status
 --   - Batch discovers all files in single call
 -- ============================================
@@ -47,13 +47,15 @@ BEGIN
     -- Discover CSV files
     -- Note: Now stores full RELATIVE_PATH to support TPA folder structure
     -- RELATIVE_PATH format: provider_a/file.csv or just file.csv (for legacy)
-    INSERT INTO file_processing_queue (file_name, file_type, status)
+    -- CSV files uploaded through Streamlit are gzip-compressed on PUT (file.csv.gz)
+    INSERT INTO file_processing_queue (file_name, file_type, tpa, status)
     SELECT 
         RELATIVE_PATH AS file_name,  -- Store full path including TPA folder
         'CSV' AS file_type,
+        IFF(CONTAINS(RELATIVE_PATH, '/'), SPLIT_PART(RELATIVE_PATH, '/', -2), NULL) AS tpa,  -- Folder before filename
         'PENDING' AS status
     FROM DIRECTORY(@SRC)
-    WHERE LOWER(RELATIVE_PATH) LIKE '%.csv'
+    WHERE (LOWER(RELATIVE_PATH) LIKE '%.csv' OR LOWER(RELATIVE_PATH) LIKE '%.csv.gz')
     AND RELATIVE_PATH NOT IN (
         SELECT file_name FROM file_processing_queue 
         WHERE status IN ('PENDING', 'PROCESSING', 'SUCCESS')
@@ -62,10 +64,11 @@ BEGIN
     files_added := SQLROWCOUNT;
     
     -- Discover Excel files
-    INSERT INTO file_processing_queue (file_name, file_type, status)
+    INSERT INTO file_processing_queue (file_name, file_type, tpa, status)
     SELECT 
         RELATIVE_PATH AS file_name,  -- Store full path including TPA folder
         'EXCEL' AS file_type,
+        IFF(CONTAINS(RELATIVE_PATH, '/'), SPLIT_PART(RELATIVE_PATH, '/', -2), NULL) AS tpa,  -- Folder before filename
         'PENDING' AS status
     FROM DIRECTORY(@SRC)
     WHERE (LOWER(RELATIVE_PATH) LIKE '%.xlsx' OR LOWER(RELATIVE_PATH) LIKE '%.xls')
@@ -92,6 +95,7 @@ $$;
 --   - Updates status to PROCESSING before calling procedure
 --   - Routes to appropriate processor based on file_type
 --   - Updates status to SUCCESS/FAILED based on result
+--   - Stores the processed row count in rows_processed on SUCCESS
 --   - Captures error messages for debugging
 --
 -- Note: Calls process_single_csv_file() and process_single_excel_file()
@@ -138,7 +142,8 @@ BEGIN
             -- Update status based on result
             IF (STARTSWITH(:result, 'SUCCESS')) THEN
                 UPDATE file_processing_queue 
-                SET status = 'SUCCESS', process_result = :result
+                SET status = 'SUCCESS', process_result = :result,
+                    rows_processed = TRY_TO_NUMBER(REGEXP_SUBSTR(:result, '[0-9]+'))
                 WHERE queue_id = :queue_id;
             ELSE
                 UPDATE file_processing_queue 
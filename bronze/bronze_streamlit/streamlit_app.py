@@ -19,11 +19,15 @@ Usage:
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
 from snowflake.snowpark.context import get_active_session
 from snowflake.snowpark.exceptions import SnowparkSQLException
-import tempfile
+import io
+import json
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Page configuration
 st.set_page_config(
@@ -125,10 +129,15 @@ def get_snowflake_session():
 
 session = get_snowflake_session()
 
+# Maximum number of concurrent PUT operations when uploading multiple files. Each file is
+# uploaded as a single PUT, so this one pool bounds the PUTs a session has in flight
+MAX_UPLOAD_WORKERS = 8
+MAX_TASK_ACTION_WORKERS = 8
+
 # Get list of TPAs
 @st.cache_data(ttl=300)
 def get_tpa_list(_session):
-    """Get list of active TPAs from TPA_MASTER table"""
+    """Get active TPAs from TPA_MASTER as (codes, name_by_code, index_by_code), prepared once for the header selector"""
     try:
         query = """
             SELECT TPA_CODE, TPA_NAME, TPA_DESCRIPTION
@@ -137,32 +146,35 @@ def get_tpa_list(_session):
             ORDER BY TPA_CODE
         """
         result = _session.sql(query).collect()
-        return [(row['TPA_CODE'], row['TPA_NAME']) for row in result]
+        codes = [row['TPA_CODE'] for row in result]
+        name_by_code = {row['TPA_CODE']: row['TPA_NAME'] for row in result}
+        index_by_code = {code: index for index, code in enumerate(codes)}
+        return codes, name_by_code, index_by_code
     except Exception as e:
         st.error(f"Error loading TPAs: {e}")
-        return []
+        return [], {}, {}
 
-tpa_list = get_tpa_list(session)
+tpa_codes, tpa_name_by_code, tpa_index_by_code = get_tpa_list(session)
 
 # Create header with TPA selector
 col1, col2 = st.columns([3, 1])
 
 with col1:
-    if tpa_list:
+    if tpa_codes:
         # Initialize session state for TPA if not exists
         if 'selected_tpa' not in st.session_state:
-            st.session_state.selected_tpa = tpa_list[0][0]
+            st.session_state.selected_tpa = tpa_codes[0]
         
         # TPA selector with label
-        tpa_options = {f"{name}": code for code, name in tpa_list}
-        selected_tpa_name = st.selectbox(
+        selected_tpa = st.selectbox(
             "TPA:",
-            options=list(tpa_options.keys()),
-            index=list(tpa_options.values()).index(st.session_state.selected_tpa) if st.session_state.selected_tpa in tpa_options.values() else 0,
+            options=tpa_codes,
+            format_func=tpa_name_by_code.get,
+            index=tpa_index_by_code.get(st.session_state.selected_tpa, 0),
             key="tpa_selector"
         )
-        st.session_state.selected_tpa = tpa_options[selected_tpa_name]
-        st.session_state.selected_tpa_name = selected_tpa_name
+        st.session_state.selected_tpa = selected_tpa
+        st.session_state.selected_tpa_name = tpa_name_by_code[selected_tpa]
     else:
         st.warning("⚠️ No TPAs found. Please configure TPAs in TPA_MASTER table.")
         st.session_state.selected_tpa = None
@@ -192,9 +204,16 @@ page = st.sidebar.radio(
 )
 st.sidebar.markdown("---")
 
+# Matches KEY=value lines in config files (values may be wrapped in quotes)
+CONFIG_LINE_PATTERN = re.compile(r'^\s*([A-Z_]+)\s*=\s*["\']?(.*?)["\']?\s*$')
+
+# Bump to invalidate cached configuration after a deliberate config change
+CONFIG_CACHE_VERSION = 1
+
 # Load configuration from Snowflake stage
-@st.cache_data(ttl=300)
-def load_config_from_stage(_session):
+# Cached as a resource: the parsed dict is shared read-only across reruns without pickling
+@st.cache_resource(ttl=300)
+def load_config_from_stage(_session, cache_version=CONFIG_CACHE_VERSION):
     """Load configuration from config file stored in Snowflake stage"""
     config = {
         'DATABASE_NAME': 'db_ingest_pipeline',
@@ -209,62 +228,97 @@ def load_config_from_stage(_session):
         'MOVE_SUCCESS_TASK_NAME': 'move_successful_files_task',
         'MOVE_FAILED_TASK_NAME': 'move_failed_files_task',
         'ARCHIVE_TASK_NAME': 'archive_old_files_task',
-        'DISCOVER_TASK_SCHEDULE_MINUTES': '60'
+        'DISCOVER_TASK_SCHEDULE_MINUTES': '60',
+        'AUTO_COMPRESS_CSV': 'true'
     }
     
     try:
-        # Try to read from config stage - try custom.config first, then default.config
-        for config_file in ['custom.config', 'default.config']:
-            try:
-                # Get file from stage
-                result = _session.sql(f"SELECT $1 FROM @CONFIG_STAGE/{config_file}").collect()
-                
-                # Parse config file
-                for row in result:
-                    line = row[0].strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip().strip('"').strip("'")
-                        if key in config:
-                            config[key] = value
-                
-                # If we found a config file, break
-                st.sidebar.success(f"✓ Loaded config: {config_file}")
-                break
-            except:
-                continue
+        # List the config stage once and only read the file that exists
+        # (custom.config takes precedence over default.config)
+        staged_files = {
+            row['name'].rsplit('/', 1)[-1]
+            for row in _session.sql("LIST @CONFIG_STAGE").collect()
+        }
+        config_file = next(
+            (name for name in ['custom.config', 'default.config'] if name in staged_files),
+            None
+        )
+        
+        if config_file:
+            # Get file from stage
+            result = _session.sql(f"SELECT $1 FROM @CONFIG_STAGE/{config_file}").collect()
+            
+            # Parse config file (comments and blank lines never match the pattern)
+            for row in result:
+                match = CONFIG_LINE_PATTERN.match(row[0] or '')
+                if match and match.group(1) in config:
+                    config[match.group(1)] = match.group(2)
+            
+            st.sidebar.success(f"✓ Loaded config: {config_file}")
+        else:
+            st.sidebar.warning("⚠️ Using default configuration")
         
     except Exception as e:
-        st.sidebar.warning(f"⚠️ Using default configuration")
+        st.sidebar.warning("⚠️ Using default configuration")
     
     return config
 
+@st.cache_data(ttl=600)
+def get_session_context(_session, session_id):
+    """Get current user and role in a single query, cached per Snowflake session"""
+    row = _session.sql("SELECT CURRENT_USER(), CURRENT_ROLE()").collect()[0]
+    return row[0], row[1]
+
+# Accepted upload extensions and maximum upload size
+VALID_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+MAX_UPLOAD_SIZE_BYTES = 100 * 1024 * 1024  # 100MB
+
+# Number of leading bytes read to sniff the file type during validation
+FILE_SNIFF_BYTES = 4096
+
+# Magic bytes expected at the start of Excel files (xlsx is a zip, xls is an OLE2 compound file)
+EXCEL_SIGNATURES = {
+    '.xlsx': b'PK\x03\x04',
+    '.xls': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+}
+
 def validate_file(file):
     """Validate uploaded file"""
-    valid_extensions = ['.csv', '.xlsx', '.xls']
-    file_ext = os.path.splitext(file.name)[1].lower()
+    name_lower = file.name.lower()
+    
+    if not name_lower.endswith(VALID_EXTENSIONS):
+        return False, f"Invalid file type: {os.path.splitext(name_lower)[1]}. Supported types: {', '.join(VALID_EXTENSIONS)}"
     
-    if file_ext not in valid_extensions:
-        return False, f"Invalid file type: {file_ext}. Supported types: {', '.join(valid_extensions)}"
+    file_ext = name_lower[name_lower.rfind('.'):]
     
     # Check file size (max 100MB)
-    max_size = 100 * 1024 * 1024  # 100MB
-    if file.size > max_size:
+    if file.size > MAX_UPLOAD_SIZE_BYTES:
         return False, f"File too large: {file.size / (1024*1024):.2f}MB. Maximum: 100MB"
     
+    # Sniff the first bytes only so invalid content is rejected before a full PUT
+    file.seek(0)
+    head = file.read(FILE_SNIFF_BYTES)
+    file.seek(0)
+    
+    if not head:
+        return False, "File is empty"
+    
+    signature = EXCEL_SIGNATURES.get(file_ext)
+    if signature and not head.startswith(signature):
+        return False, f"File content does not match {file_ext} format"
+    
+    if file_ext == '.csv' and b'\x00' in head:
+        return False, "File does not look like a text CSV (binary content found)"
+    
     return True, "Valid"
 
-def upload_file_to_stage(session, file, stage_name, tpa_folder=None):
+def upload_file_to_stage(session, file, stage_name, tpa_folder=None, compress_csv=False):
     """Upload file to Snowflake stage preserving original filename and optional TPA folder structure"""
     try:
-        # Create temporary directory to preserve original filename
-        temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, file.name)
-        
-        # Write file with original name
-        with open(temp_file_path, 'wb') as tmp_file:
-            tmp_file.write(file.getvalue())
+        # CSV compresses well with gzip; Excel files are already zip archives,
+        # so re-compressing them only burns CPU
+        file_ext = os.path.splitext(file.name)[1].lower()
+        auto_compress = compress_csv and file_ext == '.csv'
         
         # Construct stage path with optional TPA subfolder
         if tpa_folder:
@@ -272,21 +326,19 @@ def upload_file_to_stage(session, file, stage_name, tpa_folder=None):
         else:
             stage_path = f"@{stage_name}"
         
-        # Upload to stage (this will preserve the original filename)
-        put_result = session.file.put(
-            temp_file_path,
-            stage_path,
-            auto_compress=False,
+        # Stream the uploaded buffer straight to the stage (no temp file on disk).
+        # UploadedFile is a seekable BytesIO, so it can be passed as-is without copying its bytes.
+        file.seek(0)
+        put_result = session.file.put_stream(
+            file,
+            f"{stage_path}/{file.name}",
+            auto_compress=auto_compress,
             overwrite=True
         )
         
-        # Clean up temporary file and directory
-        os.unlink(temp_file_path)
-        os.rmdir(temp_dir)
-        
         # Check result
-        if put_result and len(put_result) > 0:
-            status = put_result[0].status
+        if put_result:
+            status = put_result.status
             if status == "UPLOADED" or status == "SKIPPED":
                 return True, "Upload successful"
             else:
@@ -296,84 +348,183 @@ def upload_file_to_stage(session, file, stage_name, tpa_folder=None):
     except Exception as e:
         return False, f"Upload error: {str(e)}"
 
-def get_processed_files_summary(session, database_name, schema_name):
-    """Get summary of all processed files with status and TPA"""
-    try:
-        query = f"""
-        SELECT 
-            fpq.file_name,
-            fpq.file_type,
-            fpq.status,
-            fpq.discovered_timestamp,
-            fpq.processed_timestamp,
-            fpq.process_result,
-            fpq.error_message,
-            COALESCE(rdt.tpa, 'N/A') as tpa
-        FROM {database_name}.{schema_name}.file_processing_queue fpq
-        LEFT JOIN (
-            SELECT DISTINCT file_name, tpa
-            FROM {database_name}.{schema_name}.RAW_DATA_TABLE
-        ) rdt ON fpq.file_name = rdt.file_name
-        ORDER BY fpq.discovered_timestamp DESC
-        """
-        result = session.sql(query).to_pandas()
-        
-        # Normalize column names: remove quotes and convert to lowercase
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
-        
+def normalize_columns(result):
+    """Strip quotes from and lowercase column names of a pandas DataFrame or pyarrow Table"""
+    names = list(result.columns) if isinstance(result, pd.DataFrame) else result.column_names
+    normalized = [name.strip('"').lower() for name in names]
+    if normalized == names:
         return result
-    except Exception as e:
-        st.error(f"Error fetching processed files: {e}")
-        return pd.DataFrame()
-
-def get_processed_files_stats(session, database_name, schema_name, tpa_code=None):
-    """Get statistics about processed files, optionally filtered by TPA"""
-    try:
-        # Build WHERE clause for TPA filter
-        tpa_filter = ""
-        if tpa_code:
-            tpa_filter = f"""
-            WHERE fpq.file_name IN (
-                SELECT DISTINCT file_name 
-                FROM {database_name}.{schema_name}.RAW_DATA_TABLE 
-                WHERE tpa = '{tpa_code}'
-            )
-            """
-        
-        query = f"""
-        SELECT 
-            COUNT(*) as total_files,
-            SUM(CASE WHEN status = 'SUCCESS' THEN 1 ELSE 0 END) as successful_files,
-            SUM(CASE WHEN status = 'FAILED' THEN 1 ELSE 0 END) as failed_files,
-            SUM(CASE WHEN status = 'PROCESSING' THEN 1 ELSE 0 END) as processing_files,
-            SUM(CASE WHEN status = 'PENDING' THEN 1 ELSE 0 END) as pending_files,
-            SUM(CASE WHEN process_result LIKE '%rows%' THEN 
-                TRY_CAST(REGEXP_SUBSTR(process_result, '[0-9]+') AS INTEGER) 
-                ELSE 0 END) as total_rows_processed
-        FROM {database_name}.{schema_name}.file_processing_queue fpq
-        {tpa_filter}
-        """
-        result = session.sql(query).to_pandas()
-        
-        # Normalize column names: remove quotes and convert to lowercase
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
-        
+    if isinstance(result, pd.DataFrame):
+        result.columns = normalized
         return result
-    except Exception as e:
-        st.error(f"Error fetching statistics: {e}")
-        return pd.DataFrame()
+    return result.rename_columns(normalized)
+
+def to_arrow_pandas(snowpark_df):
+    """Fetch a query result as Arrow and wrap it in an Arrow-backed pandas DataFrame (no per-value Python objects)"""
+    return normalize_columns(snowpark_df.to_arrow().to_pandas(types_mapper=pd.ArrowDtype))
+
+def scalar_row(session, query, params=None):
+    """Run a single-row query and return it as a dict with lowercase keys (no pandas conversion)"""
+    rows = session.sql(query, params=params).collect()
+    return {key.lower(): value for key, value in rows[0].as_dict().items()} if rows else {}
+
+def to_datetime_column(series):
+    """Convert a timestamp column to datetime64, parsing ISO-8601 text without per-element format inference"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, format="ISO8601", errors="coerce")
+
+# SQL templates - table names, filters and IN-lists are bound as parameters so the
+# query text is identical across reruns (and eligible for Snowflake's result cache).
+# IN-lists are bound as a JSON array; a NULL array disables the filter.
+PROCESSED_FILES_SUMMARY_SQL = """
+SELECT 
+    file_name,
+    file_type,
+    status,
+    discovered_timestamp,
+    processed_timestamp,
+    process_result,
+    error_message,
+    COALESCE(tpa, 'N/A') as tpa
+FROM IDENTIFIER(?)
+WHERE (? IS NULL OR ARRAY_CONTAINS(status::VARIANT, PARSE_JSON(?)))
+  AND (? IS NULL OR ARRAY_CONTAINS(file_type::VARIANT, PARSE_JSON(?)))
+  AND (? IS NULL OR tpa = ?)
+ORDER BY discovered_timestamp DESC
+LIMIT {limit}
+"""
+
+PROCESSED_FILES_STATS_SQL = """
+SELECT 
+    COUNT(*) as total_files,
+    SUM(CASE WHEN status = 'SUCCESS' THEN 1 ELSE 0 END) as successful_files,
+    SUM(CASE WHEN status = 'FAILED' THEN 1 ELSE 0 END) as failed_files,
+    SUM(CASE WHEN status = 'PROCESSING' THEN 1 ELSE 0 END) as processing_files,
+    SUM(CASE WHEN status = 'PENDING' THEN 1 ELSE 0 END) as pending_files,
+    COALESCE(SUM(rows_processed), 0) as total_rows_processed
+FROM IDENTIFIER(?)
+WHERE (? IS NULL OR tpa = ?)
+"""
+
+TASK_HISTORY_SQL = """
+SELECT 
+    name,
+    state,
+    scheduled_time,
+    completed_time,
+    (DATEDIFF('millisecond', scheduled_time, completed_time) / 1000)::FLOAT AS runtime_seconds,
+    error_message
+FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY
+WHERE database_name = ?
+  AND schema_name = ?
+  AND ARRAY_CONTAINS(name::VARIANT, PARSE_JSON(?))
+  AND scheduled_time >= TO_TIMESTAMP_LTZ({since_epoch})
+QUALIFY ROW_NUMBER() OVER (PARTITION BY name ORDER BY scheduled_time DESC) <= {limit}
+ORDER BY name, scheduled_time DESC
+"""
+
+TASK_RUNTIME_STATS_SQL = """
+SELECT 
+    name,
+    AVG(DATEDIFF('millisecond', scheduled_time, completed_time) / 1000) AS avg_runtime,
+    MIN(DATEDIFF('millisecond', scheduled_time, completed_time) / 1000) AS min_runtime,
+    MAX(DATEDIFF('millisecond', scheduled_time, completed_time) / 1000) AS max_runtime,
+    COUNT(completed_time) AS total_runs
+FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY
+WHERE database_name = ?
+  AND schema_name = ?
+  AND ARRAY_CONTAINS(name::VARIANT, PARSE_JSON(?))
+  AND scheduled_time >= TO_TIMESTAMP_LTZ({since_epoch})
+GROUP BY name
+"""
 
-def get_stage_files(session, stage_name):
+RAW_DATA_SUMMARY_SQL = """
+SELECT 
+    COUNT(*) as total_rows,
+    COUNT(DISTINCT FILE_NAME) as unique_files,
+    COUNT(DISTINCT TPA) as unique_tpas,
+    MIN(LOAD_TIMESTAMP) as earliest_load,
+    MAX(LOAD_TIMESTAMP) as latest_load
+FROM IDENTIFIER(?)
+"""
+
+RAW_DATA_BY_FILTERS_SQL = """
+SELECT 
+    RAW_ID,
+    FILE_NAME,
+    TPA,
+    FILE_ROW_NUMBER,
+    TO_VARCHAR(RAW_DATA) AS RAW_DATA,  -- Serialized to JSON text server-side
+    LOAD_TIMESTAMP,
+    FILE_SIZE,
+    FILE_LAST_MODIFIED
+FROM IDENTIFIER(?)
+WHERE (? IS NULL OR ARRAY_CONTAINS(TPA::VARIANT, PARSE_JSON(?)))
+  AND (? IS NULL OR ARRAY_CONTAINS(FILE_NAME::VARIANT, PARSE_JSON(?)))
+ORDER BY LOAD_TIMESTAMP DESC, RAW_ID DESC
+LIMIT {limit}
+OFFSET {offset}
+"""
+
+RAW_DATA_TPAS_SQL = """
+SELECT DISTINCT TPA
+FROM IDENTIFIER(?)
+WHERE TPA IS NOT NULL
+ORDER BY TPA
+"""
+
+RAW_DATA_FILES_SQL = """
+SELECT DISTINCT FILE_NAME
+FROM IDENTIFIER(?)
+WHERE (? IS NULL OR TPA = ?)
+  AND (? IS NULL OR STARTSWITH(SPLIT_PART(FILE_NAME, '/', -1), ?))
+ORDER BY FILE_NAME
+LIMIT {limit}
+"""
+
+# Row caps for the processed files listing ("Load older" adds another page) and file filter options
+PROCESSED_FILES_PAGE_SIZE = 1000
+FILE_OPTIONS_LIMIT = 500
+
+def qualified_name(database_name, schema_name, object_name):
+    """Build a fully-qualified object name for binding into IDENTIFIER(?)"""
+    return f"{database_name}.{schema_name}.{object_name}"
+
+def json_list_param(values):
+    """Encode an optional filter list as a JSON array bind (None disables the filter)"""
+    return json.dumps(list(values)) if values is not None else None
+
+@st.cache_data(ttl=60)
+def get_processed_files_summary(_session, database_name, schema_name, status_filter=None, file_type_filter=None, tpa_filter=None, limit=PROCESSED_FILES_PAGE_SIZE):
+    """Get processed files with status and TPA, filtered and limited in Snowflake.
+    Query errors are raised (and so not cached) for the caller to report."""
+    status_param = json_list_param(status_filter)
+    file_type_param = json_list_param(file_type_filter)
+    tpa_param = tpa_filter or None
+    params = [
+        qualified_name(database_name, schema_name, 'file_processing_queue'),
+        status_param, status_param,
+        file_type_param, file_type_param,
+        tpa_param, tpa_param
+    ]
+    query = PROCESSED_FILES_SUMMARY_SQL.format(limit=int(limit))
+    return to_arrow_pandas(_session.sql(query, params=params))
+
+@st.cache_data(ttl=60)
+def get_processed_files_stats(_session, database_name, schema_name, tpa_code=None):
+    """Get statistics about processed files, optionally filtered by TPA.
+    Query errors are raised (and so not cached) for the caller to report."""
+    tpa_param = tpa_code or None
+    params = [qualified_name(database_name, schema_name, 'file_processing_queue'), tpa_param, tpa_param]
+    return scalar_row(_session, PROCESSED_FILES_STATS_SQL, params)
+
+@st.cache_data(ttl=60)
+def get_stage_files(_session, stage_name):
     """Get list of files in stage"""
     try:
         query = f"LIST @{stage_name}"
-        result = session.sql(query).to_pandas()
-        # Normalize column names (remove quotes and convert to lowercase)
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
-        return result
+        return normalize_columns(_session.sql(query).to_pandas())
     except Exception as e:
         st.error(f"Error listing stage: {e}")
         return pd.DataFrame()
@@ -392,19 +543,16 @@ def get_task_status(session, database_name, schema_name, task_name):
         st.error(f"Error getting task status: {e}")
         return None
 
-def get_all_tasks_status(session, database_name, schema_name):
+TASK_STATUS_REFRESH_SECONDS = 30
+
+@st.cache_data(ttl=TASK_STATUS_REFRESH_SECONDS, max_entries=32)
+def get_all_tasks_status(_session, database_name, schema_name):
     """Get status of all tasks in the schema"""
     try:
         query = f"""
         SHOW TASKS IN SCHEMA {database_name}.{schema_name}
         """
-        result = session.sql(query).to_pandas()
-        
-        # Normalize column names: remove quotes and convert to lowercase
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
-        
-        return result
+        return normalize_columns(_session.sql(query).to_pandas())
     except Exception as e:
         st.error(f"Error getting tasks: {e}")
         return pd.DataFrame()
@@ -436,149 +584,925 @@ def suspend_task(session, database_name, schema_name, task_name):
     except Exception as e:
         return False, f"Error suspending task: {str(e)}"
 
-def get_task_history(session, database_name, schema_name, task_name, limit=10):
-    """Get recent task execution history using ACCOUNT_USAGE (accessible from stored procedures)"""
+def run_task_action(action, session, database_name, schema_name, task_names):
+    """Apply resume_task/suspend_task to several tasks concurrently and return the number that succeeded"""
+    if not task_names:
+        return 0
+    # Each ALTER TASK is a separate round trip, so fan them out instead of waiting on each in turn
+    with ThreadPoolExecutor(max_workers=min(MAX_TASK_ACTION_WORKERS, len(task_names))) as executor:
+        results = executor.map(lambda task_name: action(session, database_name, schema_name, task_name), task_names)
+        return sum(1 for success, _ in results if success)
+
+# Task history window start is rounded to this many seconds so the SQL text stays
+# identical between reruns and Snowflake's result cache can serve repeat loads
+TASK_HISTORY_BUCKET_SECONDS = 300
+
+# Runs shown per task card - the history query caps rows per task, so only these reach the browser
+TASK_HISTORY_ROWS_PER_TASK = 5
+
+def task_history_since_epoch():
+    """Start of the 24-hour task history window, measured from the start of the current time bucket"""
+    return (int(time.time()) // TASK_HISTORY_BUCKET_SECONDS) * TASK_HISTORY_BUCKET_SECONDS - 24 * 3600
+
+@st.cache_data(ttl=TASK_HISTORY_BUCKET_SECONDS, max_entries=32)
+def get_task_history(_session, database_name, schema_name, task_names, limit=10):
+    """Get recent execution history for several tasks in one ACCOUNT_USAGE query (latest `limit` runs per task)"""
     try:
         # INFORMATION_SCHEMA.TASK_HISTORY() is not accessible from stored procedures
         # Use SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY instead (has ~45 min latency but works in SiS)
-        query = f"""
-        SELECT 
-            name,
-            state,
-            scheduled_time,
-            completed_time,
-            return_value,
-            error_code,
-            error_message
-        FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY
-        WHERE database_name = '{database_name.upper()}'
-          AND schema_name = '{schema_name.upper()}'
-          AND name = '{task_name.upper()}'
-          AND scheduled_time >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
-        ORDER BY scheduled_time DESC
-        LIMIT {limit}
-        """
-        result = session.sql(query).to_pandas()
-        
-        # Normalize column names: remove quotes and convert to lowercase
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
-        
-        return result
+        params = [database_name.upper(), schema_name.upper(), json.dumps([name.upper() for name in task_names])]
+        query = TASK_HISTORY_SQL.format(since_epoch=task_history_since_epoch(), limit=int(limit))
+        return to_arrow_pandas(_session.sql(query, params=params))
     except Exception as e:
         st.warning(f"Unable to load task history from local database: {str(e)}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=300)
-def get_tpa_list(_session, database_name, schema_name):
-    """Get list of active TPAs from TPA_MASTER table"""
+@st.cache_data(ttl=TASK_HISTORY_BUCKET_SECONDS, max_entries=32)
+def get_task_runtime_stats(_session, database_name, schema_name, task_names):
+    """Get 24-hour runtime statistics per task, aggregated in Snowflake, keyed by task name"""
     try:
-        query = f"""
-        SELECT 
-            TPA_CODE,
-            TPA_NAME,
-            TPA_DESCRIPTION
-        FROM {database_name}.{schema_name}.TPA_MASTER
-        WHERE ACTIVE = TRUE
-        ORDER BY TPA_CODE
-        """
-        result = _session.sql(query).to_pandas()
-        
-        # Normalize column names: remove quotes and convert to lowercase
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
-        
-        return result
+        params = [database_name.upper(), schema_name.upper(), json.dumps([name.upper() for name in task_names])]
+        query = TASK_RUNTIME_STATS_SQL.format(since_epoch=task_history_since_epoch())
+        rows = _session.sql(query, params=params).collect()
+        return {row['NAME']: {key.lower(): value for key, value in row.as_dict().items()} for row in rows}
     except Exception as e:
-        st.error(f"Error loading TPA list: {e}")
-        # Return empty dataframe if table doesn't exist yet
-        return pd.DataFrame(columns=['tpa_code', 'tpa_name', 'tpa_description'])
+        st.warning(f"Unable to load task runtime statistics: {str(e)}")
+        return {}
 
-def get_raw_data_summary(session, database_name, schema_name):
+@st.cache_data(ttl=60)
+def get_raw_data_summary(_session, database_name, schema_name):
     """Get summary statistics of RAW_DATA_TABLE"""
     try:
-        query = f"""
-        SELECT 
-            COUNT(*) as total_rows,
-            COUNT(DISTINCT FILE_NAME) as unique_files,
-            COUNT(DISTINCT TPA) as unique_tpas,
-            MIN(LOAD_TIMESTAMP) as earliest_load,
-            MAX(LOAD_TIMESTAMP) as latest_load
-        FROM {database_name}.{schema_name}.RAW_DATA_TABLE
-        """
-        result = session.sql(query).to_pandas()
+        return scalar_row(_session, RAW_DATA_SUMMARY_SQL, [qualified_name(database_name, schema_name, 'RAW_DATA_TABLE')])
+    except Exception as e:
+        st.error(f"Error fetching raw data summary: {e}")
+        return {}
+
+@st.cache_data(ttl=60)
+def get_raw_data_by_filters(_session, database_name, schema_name, tpa_filter=None, file_filter=None, limit=100, offset=0):
+    """Get raw data with filters and pagination as a pyarrow Table"""
+    try:
+        tpa_param = json_list_param(tpa_filter) if tpa_filter else None
+        file_param = json_list_param(file_filter) if file_filter else None
+        params = [
+            qualified_name(database_name, schema_name, 'RAW_DATA_TABLE'),
+            tpa_param, tpa_param,
+            file_param, file_param
+        ]
+        query = RAW_DATA_BY_FILTERS_SQL.format(limit=int(limit), offset=int(offset))
         
-        # Normalize column names
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
+        # Fetch as an Arrow table; st.dataframe renders it without a pandas copy
+        return normalize_columns(_session.sql(query, params=params).to_arrow())
+    except Exception as e:
+        st.error(f"Error fetching raw data: {e}")
+        return pa.table({})
+
+@st.cache_data(ttl=60)
+def get_raw_data_tpas(_session, database_name, schema_name):
+    """Get distinct TPAs in RAW_DATA_TABLE for filter options"""
+    try:
+        rows = _session.sql(RAW_DATA_TPAS_SQL, params=[qualified_name(database_name, schema_name, 'RAW_DATA_TABLE')]).collect()
+        return [row[0] for row in rows]
+    except Exception as e:
+        st.error(f"Error fetching TPAs: {e}")
+        return []
+
+@st.cache_data(ttl=60)
+def get_raw_data_files(_session, database_name, schema_name, tpa=None, prefix=None, limit=FILE_OPTIONS_LIMIT + 1):
+    """Get distinct file names in RAW_DATA_TABLE for filter options, optionally for one TPA and name prefix
+    (the prefix is matched against the base name, after any TPA folder)"""
+    try:
+        params = [qualified_name(database_name, schema_name, 'RAW_DATA_TABLE'), tpa, tpa, prefix, prefix]
+        rows = _session.sql(RAW_DATA_FILES_SQL.format(limit=int(limit)), params=params).collect()
+        return [row[0] for row in rows]
+    except Exception as e:
+        st.error(f"Error fetching files: {e}")
+        return []
+
+# Status values with their display emoji
+STATUS_EMOJI = {
+    'SUCCESS': '✅',
+    'FAILED': '❌',
+    'PROCESSING': '⏳',
+    'PENDING': '⏸️'
+}
+STATUS_LABELS = {status: f"{emoji} {status}" for status, emoji in STATUS_EMOJI.items()}
+
+# Display names for the Processing Status and Raw Data Viewer tables
+# (processed files columns are listed in display order - TPA after Type)
+PROCESSED_FILES_DISPLAY_NAMES = {
+    'file_name': 'File Name',
+    'file_type': 'Type',
+    'tpa': 'TPA',
+    'status': 'Status',
+    'discovered_timestamp': 'Discovered',
+    'processed_timestamp': 'Processed',
+    'process_result': 'Result',
+    'error_message': 'Error'
+}
+
+RAW_DATA_DISPLAY_NAMES = {
+    'raw_id': 'ID',
+    'file_name': 'File Name',
+    'tpa': 'TPA',
+    'file_row_number': 'Row #',
+    'raw_data': 'Data (JSON)',
+    'load_timestamp': 'Loaded',
+    'file_size_kb': 'File Size (KB)',
+    'file_last_modified': 'File Modified'
+}
+
+# Column configs are built once at import time and shared by every render
+PROCESSED_FILES_COLUMN_CONFIG = {
+    "Type": st.column_config.TextColumn(width="small"),
+    "TPA": st.column_config.TextColumn(width="small"),
+    "Status": st.column_config.TextColumn(width="small"),
+    "Discovered": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss"),
+    "Processed": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm:ss"),
+    "Result": st.column_config.TextColumn(width="medium"),
+    "Error": st.column_config.TextColumn(width="large")
+}
+
+RAW_DATA_COLUMN_CONFIG = {
+    "ID": st.column_config.NumberColumn(width="small"),
+    "File Name": st.column_config.TextColumn(width="medium"),
+    "TPA": st.column_config.TextColumn(width="small"),
+    "Row #": st.column_config.NumberColumn(width="small"),
+    "Data (JSON)": st.column_config.TextColumn(width="large"),
+    "Loaded": st.column_config.DatetimeColumn(width="medium", format="YYYY-MM-DD HH:mm:ss"),
+    "File Size (KB)": st.column_config.NumberColumn(width="small", format="%.2f")
+}
+
+STAGE_FILES_COLUMN_CONFIG = {
+    "name": "File Path",
+    "size": st.column_config.NumberColumn(
+        "Size (bytes)",
+        format="%d"
+    ),
+    "md5": "MD5 Hash",
+    "last_modified": st.column_config.DatetimeColumn(
+        "Last Modified",
+        format="YYYY-MM-DD HH:mm:ss"
+    )
+}
+
+# Columns shown in the task card history grid, in display order
+TASK_HISTORY_COLUMNS = ['state', 'scheduled_time', 'completed_time', 'runtime_seconds', 'error_message']
+
+TASK_HISTORY_COLUMN_CONFIG = {
+    "state": st.column_config.TextColumn(
+        "Status",
+        width="small"
+    ),
+    "scheduled_time": st.column_config.DatetimeColumn(
+        "Scheduled",
+        format="MM/DD HH:mm:ss",
+        width="medium"
+    ),
+    "completed_time": st.column_config.DatetimeColumn(
+        "Completed",
+        format="MM/DD HH:mm:ss",
+        width="medium"
+    ),
+    "runtime_seconds": st.column_config.NumberColumn(
+        "Runtime (s)",
+        format="%.2f",
+        width="small"
+    ),
+    "error_message": st.column_config.TextColumn(
+        "Error",
+        width="medium"
+    )
+}
+
+# CSV exports are built once per filter selection (not on every rerun) from the cached query results
+@st.cache_data(ttl=60)
+def get_processed_files_csv(_session, database_name, schema_name, status_filter=None, file_type_filter=None, tpa_filter=None, limit=PROCESSED_FILES_PAGE_SIZE):
+    """Get the processed files listing as CSV bytes for download"""
+    files_df = get_processed_files_summary(_session, database_name, schema_name, status_filter, file_type_filter, tpa_filter, limit)
+    return files_df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(ttl=60)
+def get_raw_data_csv(_session, database_name, schema_name, tpa_filter=None, file_filter=None, limit=100, offset=0):
+    """Get filtered raw data as CSV bytes for download, written by Arrow's C++ CSV writer"""
+    import pyarrow.csv as pa_csv
+    
+    buffer = io.BytesIO()
+    pa_csv.write_csv(get_raw_data_by_filters(_session, database_name, schema_name, tpa_filter, file_filter, limit, offset), buffer)
+    return buffer.getvalue()
+
+def clear_processing_status_cache():
+    """Clear cached processed-file statistics and listings"""
+    get_processed_files_stats.clear()
+    get_processed_files_summary.clear()
+    get_processed_files_csv.clear()
+
+def clear_raw_data_cache():
+    """Clear cached raw data summary, filter options and rows"""
+    get_raw_data_summary.clear()
+    get_raw_data_tpas.clear()
+    get_raw_data_files.clear()
+    get_raw_data_by_filters.clear()
+    get_raw_data_csv.clear()
+
+def clear_catalog_cache():
+    """Clear cached stage listings, processing status, raw data and task status"""
+    get_stage_files.clear()
+    clear_processing_status_cache()
+    clear_raw_data_cache()
+    get_all_tasks_status.clear()
+
+def call_proc(session, database_name, schema_name, proc_name, *args):
+    """Call a pipeline stored procedure with bound arguments and return its result value"""
+    placeholders = ', '.join(['?'] * len(args))
+    result = session.sql(f"CALL {database_name}.{schema_name}.{proc_name}({placeholders})", params=list(args)).collect()
+    return result[0][0] if result else None
+
+def execute_discovery_task(session, database_name, schema_name, config):
+    """Execute the configured file discovery task immediately"""
+    discover_task = config.get('DISCOVER_TASK_NAME', 'discover_files_task')
+    return execute_task(session, database_name, schema_name, discover_task)
+
+def trigger_discovery_after_reprocess(database, schema, config, messages, noun):
+    """Execute the discovery task after a reprocess, recording the outcome in messages"""
+    success, msg = execute_discovery_task(session, database, schema, config)
+    if success:
+        messages.append(('success', f"✅ Discovery task executed - {noun} will be reprocessed shortly"))
+    else:
+        messages.append(('warning', f"⚠️ Could not execute discovery: {msg}"))
+        messages.append(('info', f"{noun.capitalize()} {'has' if noun == 'file' else 'have'} been moved to source stage and will be picked up on next scheduled run"))
+
+def reprocess_failed_file(database, schema, config, file_name, trigger_discovery):
+    """Button callback: reprocess one failed file; messages are shown on the rerun that follows"""
+    messages = []
+    try:
+        # Call the reprocess procedure
+        message = call_proc(session, database, schema, 'reprocess_error_file', file_name)
         
-        return result
+        if message is not None:
+            if "SUCCESS" in message:
+                messages.append(('success', f"✅ {message}"))
+                
+                if trigger_discovery:
+                    trigger_discovery_after_reprocess(database, schema, config, messages, "file")
+                else:
+                    schedule_minutes = config.get('DISCOVER_TASK_SCHEDULE_MINUTES', '5')
+                    messages.append(('info', f"File will be processed on next scheduled run (every {schedule_minutes} minutes)"))
+                
+                clear_processing_status_cache()
+            else:
+                messages.append(('error', f"❌ {message}"))
     except Exception as e:
-        st.error(f"Error fetching raw data summary: {e}")
-        return pd.DataFrame()
+        messages.append(('error', f"❌ Error reprocessing file: {str(e)}"))
+    st.session_state['reprocess_messages'] = messages
+    st.session_state['reprocess_requested'] = True
 
-def get_raw_data_by_filters(session, database_name, schema_name, tpa_filter=None, file_filter=None, limit=100, offset=0):
-    """Get raw data with filters and pagination"""
+def reprocess_all_failed_files(database, schema, config, trigger_discovery):
+    """Button callback: reprocess all failed files; messages are shown on the rerun that follows"""
+    messages = []
     try:
-        where_clauses = []
+        message = call_proc(session, database, schema, 'reprocess_all_error_files')
         
-        if tpa_filter:
-            tpa_list = "', '".join(tpa_filter)
-            where_clauses.append(f"TPA IN ('{tpa_list}')")
+        if message is not None:
+            messages.append(('success', f"✅ {message}"))
+            
+            if trigger_discovery:
+                trigger_discovery_after_reprocess(database, schema, config, messages, "files")
+            
+            clear_processing_status_cache()
+    except Exception as e:
+        messages.append(('error', f"❌ Error reprocessing files: {str(e)}"))
+    st.session_state['reprocess_messages'] = messages
+    st.session_state['reprocess_requested'] = True
+
+@st.fragment
+def render_reprocess_panel(failed_file_names, database, schema, config):
+    """Reprocess controls for failed files (a fragment, so picking a file does not re-render the file table)"""
+    # A reprocess callback ran: rerun the whole page so the file table and its messages refresh
+    if st.session_state.pop('reprocess_requested', False):
+        st.rerun()
+    
+    st.markdown("---")
+    st.markdown("### 🔄 Reprocess Failed Files")
+    st.markdown(f"Found **{len(failed_file_names)}** failed file(s) that can be reprocessed")
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        selected_failed_file = st.selectbox(
+            "Select file to reprocess:",
+            options=failed_file_names,
+            key="reprocess_failed_file_select"
+        )
+        trigger_discovery = st.checkbox("🚀 Start Discovery Now", value=True, key="trigger_discovery_after_reprocess")
+    
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)  # Spacer for alignment
+        st.button(
+            "🔄 Reprocess File",
+            type="primary",
+            use_container_width=True,
+            key="reprocess_from_status",
+            disabled=not selected_failed_file,
+            on_click=reprocess_failed_file,
+            args=(database, schema, config, selected_failed_file, trigger_discovery)
+        )
+    
+    # Batch reprocess option
+    st.markdown("---")
+    st.markdown("#### 🔄 Batch Reprocess All Failed Files")
+    st.warning(f"⚠️ This will reprocess all {len(failed_file_names)} failed file(s)")
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        batch_trigger_discovery = st.checkbox(
+            "🚀 Start Discovery After Batch Reprocess",
+            value=True,
+            key="batch_trigger_discovery"
+        )
+    
+    with col2:
+        st.button(
+            "🔄 Reprocess All",
+            type="primary",
+            use_container_width=True,
+            key="batch_reprocess_from_status",
+            on_click=reprocess_all_failed_files,
+            args=(database, schema, config, batch_trigger_discovery)
+        )
+
+@st.fragment
+def render_processing_status(database, schema, config):
+    """Processing Status page body (a fragment, so filter changes only rerun this page)"""
+    st.subheader("Processing Status")
+    st.markdown("View all files that have been processed through the pipeline with their status and statistics.")
+    
+    # Manual refresh button
+    if st.button("🔄 Refresh Now", key="refresh_now_top"):
+        clear_processing_status_cache()
+        st.rerun(scope="fragment")
+    
+    # Summary metrics are filled in once the statistics query returns, above the filters
+    metrics_container = st.container()
+    
+    st.markdown("---")
+    
+    # Filter options (Status and File Type only - TPA is in header)
+    col1, col2 = st.columns([3, 3])
+    
+    with col1:
+        status_filter = st.multiselect(
+            "Filter by Status",
+            options=["SUCCESS", "FAILED", "PROCESSING", "PENDING"],
+            default=["SUCCESS", "FAILED", "PROCESSING", "PENDING"]
+        )
+    
+    with col2:
+        file_type_filter = st.multiselect(
+            "Filter by File Type",
+            options=["CSV", "EXCEL"],
+            default=["CSV", "EXCEL"]
+        )
+    
+    # Most recent files first; "Load older files" raises the row cap a page at a time
+    files_limit = st.session_state.get('processed_files_limit', PROCESSED_FILES_PAGE_SIZE)
+    
+    # Run the statistics and file list queries concurrently. The helpers raise instead of calling
+    # st.error, so only this (main) thread writes to the page
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Statistics are filtered by the selected TPA
+        stats_future = executor.submit(get_processed_files_stats, session, database, schema, st.session_state.selected_tpa)
+        # Processed files for the selected TPA (filters are applied in Snowflake;
+        # a cleared multiselect is passed as None, meaning no filter)
+        files_future = executor.submit(
+            get_processed_files_summary,
+            session,
+            database,
+            schema,
+            status_filter=tuple(status_filter) or None,
+            file_type_filter=tuple(file_type_filter) or None,
+            tpa_filter=st.session_state.selected_tpa,
+            limit=files_limit
+        )
         
-        if file_filter:
-            file_list = "', '".join(file_filter)
-            where_clauses.append(f"FILE_NAME IN ('{file_list}')")
+        # Render metrics as soon as the statistics arrive, while the file list is still loading
+        try:
+            stats = stats_future.result()
+        except Exception as e:
+            stats = {}
+            st.error(f"Error fetching statistics: {e}")
+        with metrics_container:
+            if stats:
+                # Display summary metrics
+                col1, col2, col3, col4, col5 = st.columns(5)
+                
+                # Safely extract values, handling NULL aggregates
+                total = int(stats.get('total_files') or 0)
+                successful = int(stats.get('successful_files') or 0)
+                failed = int(stats.get('failed_files') or 0)
+                processing = int(stats.get('processing_files') or 0)
+                pending = int(stats.get('pending_files') or 0)
+                total_rows = int(stats.get('total_rows_processed') or 0)
+                
+                with col1:
+                    st.metric("Total Files", total)
+                with col2:
+                    st.metric("✅ Success", successful, delta=f"{(successful/total*100):.1f}%" if total > 0 else "0%")
+                with col3:
+                    st.metric("❌ Failed", failed, delta=f"{(failed/total*100):.1f}%" if total > 0 else "0%", delta_color="inverse")
+                with col4:
+                    st.metric("⏳ Processing", processing)
+                with col5:
+                    st.metric("📊 Total Rows", f"{total_rows:,}")
         
-        where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
+        try:
+            files_df = files_future.result()
+        except Exception as e:
+            files_df = pd.DataFrame()
+            st.error(f"Error fetching processed files: {e}")
+    
+    # Show the outcome of a reprocess started on the previous run (set by the button callbacks).
+    # Always pop them, so they can't resurface later if the filtered file list is now empty
+    for level, message in st.session_state.pop('reprocess_messages', []):
+        getattr(st, level)(message)
+    
+    if not files_df.empty:
+        # Display count
+        st.markdown(f"**Showing {len(files_df)} most recent files**" if len(files_df) >= files_limit else f"**Showing {len(files_df)} files**")
         
-        query = f"""
-        SELECT 
-            RAW_ID,
-            FILE_NAME,
-            TPA,
-            FILE_ROW_NUMBER,
-            RAW_DATA,
-            LOAD_TIMESTAMP,
-            FILE_SIZE,
-            FILE_LAST_MODIFIED
-        FROM {database_name}.{schema_name}.RAW_DATA_TABLE
-        WHERE {where_clause}
-        ORDER BY LOAD_TIMESTAMP DESC, RAW_ID DESC
-        LIMIT {limit}
-        OFFSET {offset}
-        """
-        result = session.sql(query).to_pandas()
+        # Display files table
+        # Take only the displayed columns, in display order, instead of copying the whole frame
+        display_df = files_df[[col for col in PROCESSED_FILES_DISPLAY_NAMES if col in files_df.columns]].copy()
         
-        # Normalize column names
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
+        # Add status emoji (unknown statuses are shown as-is)
+        display_df['status'] = display_df['status'].map(STATUS_LABELS).fillna(display_df['status'])
         
-        return result
-    except Exception as e:
-        st.error(f"Error fetching raw data: {e}")
-        return pd.DataFrame()
+        # Keep timestamps as datetimes - the column config formats them in the browser
+        for col in ('discovered_timestamp', 'processed_timestamp'):
+            if col in display_df.columns:
+                display_df[col] = to_datetime_column(display_df[col])
+        
+        # Rename columns for display
+        display_df = display_df.rename(columns=PROCESSED_FILES_DISPLAY_NAMES)
+        
+        # Display with expandable error messages
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config=PROCESSED_FILES_COLUMN_CONFIG
+        )
+        
+        # More files may exist beyond the current row cap
+        if len(files_df) >= files_limit:
+            st.button(
+                "⏬ Load older files",
+                key="load_older_files",
+                on_click=lambda: st.session_state.update(processed_files_limit=files_limit + PROCESSED_FILES_PAGE_SIZE)
+            )
+        
+        # Download option
+        csv = get_processed_files_csv(
+            session,
+            database,
+            schema,
+            status_filter=tuple(status_filter) or None,
+            file_type_filter=tuple(file_type_filter) or None,
+            tpa_filter=st.session_state.selected_tpa,
+            limit=files_limit
+        )
+        st.download_button(
+            label="📥 Download as CSV",
+            data=csv,
+            file_name=f"processed_files_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+        
+        # Reprocess failed files section
+        failed_mask = files_df['status'].to_numpy() == 'FAILED'
+        failed_file_names = files_df['file_name'].to_numpy()[failed_mask].tolist()
+        if failed_file_names:
+            render_reprocess_panel(failed_file_names, database, schema, config)
+    else:
+        st.info("No files match the selected filters")
 
-def get_raw_data_files_and_tpas(session, database_name, schema_name):
-    """Get distinct files and TPAs for filter options"""
-    try:
-        query = f"""
-        SELECT DISTINCT
-            FILE_NAME,
-            TPA
-        FROM {database_name}.{schema_name}.RAW_DATA_TABLE
-        ORDER BY TPA, FILE_NAME
-        """
-        result = session.sql(query).to_pandas()
+@st.fragment
+def render_raw_data_viewer(database, schema):
+    """Raw Data Viewer page body (a fragment, so filter changes only rerun this page)"""
+    # Only this page uses the Arrow compute module; import it on first visit
+    import pyarrow.compute as pc
+    
+    st.subheader("Raw Data Viewer")
+    st.markdown("View the contents of the RAW_DATA_TABLE with filtering and pagination.")
+    
+    # Get summary statistics
+    summary = get_raw_data_summary(session, database, schema)
+    
+    if summary:
+        # Display summary metrics
+        col1, col2, col3, col4, col5 = st.columns(5)
         
-        # Normalize column names
-        if not result.empty:
-            result.columns = result.columns.str.strip('"').str.lower()
+        total_rows = int(summary.get('total_rows') or 0)
+        unique_files = int(summary.get('unique_files') or 0)
+        unique_tpas = int(summary.get('unique_tpas') or 0)
         
-        return result
-    except Exception as e:
-        st.error(f"Error fetching files and TPAs: {e}")
-        return pd.DataFrame()
+        with col1:
+            st.metric("Total Rows", f"{total_rows:,}")
+        with col2:
+            st.metric("Unique Files", unique_files)
+        with col3:
+            st.metric("Unique TPAs", unique_tpas)
+        with col4:
+            if summary.get('earliest_load') is not None:
+                earliest = summary['earliest_load'].strftime('%Y-%m-%d')
+                st.metric("Earliest Load", earliest)
+            else:
+                st.metric("Earliest Load", "N/A")
+        with col5:
+            if summary.get('latest_load') is not None:
+                latest = summary['latest_load'].strftime('%Y-%m-%d')
+                st.metric("Latest Load", latest)
+            else:
+                st.metric("Latest Load", "N/A")
+    
+    st.markdown("---")
+    
+    # Get TPAs for filter options (file options are fetched for the chosen TPA below)
+    raw_tpas = get_raw_data_tpas(session, database, schema)
+    
+    if raw_tpas:
+        # Filter options
+        col1, col2, col3 = st.columns([2, 2, 1])
+        
+        with col1:
+            # TPA filter - single select with "All TPAs" option
+            tpa_options_with_all = ["All TPAs"] + raw_tpas
+            
+            selected_tpa = st.selectbox(
+                "Filter by TPA",
+                options=tpa_options_with_all,
+                index=0,
+                help="Select a TPA to view data from that provider"
+            )
+            
+            # Convert selection to filter list
+            if selected_tpa == "All TPAs":
+                tpa_filter = None
+            else:
+                tpa_filter = [selected_tpa]
+        
+        with col2:
+            # File filter (only show files for selected TPA)
+            selected_tpa_code = tpa_filter[0] if tpa_filter else None
+            file_options = get_raw_data_files(session, database, schema, selected_tpa_code)
+            
+            # Large file lists are capped; narrow them with a server-side name prefix search
+            if len(file_options) > FILE_OPTIONS_LIMIT:
+                file_prefix = st.text_input(
+                    "Search files",
+                    placeholder="File name starts with...",
+                    help=f"More than {FILE_OPTIONS_LIMIT} files - type the start of a file name to narrow the list"
+                )
+                if file_prefix:
+                    file_options = get_raw_data_files(session, database, schema, selected_tpa_code, prefix=file_prefix)
+                file_options = file_options[:FILE_OPTIONS_LIMIT]
+            
+            file_filter = st.multiselect(
+                "Filter by File",
+                options=file_options,
+                default=file_options[:3] if len(file_options) > 3 else file_options,
+                help="Select one or more files to view"
+            )
+        
+        with col3:
+            # Limit/pagination
+            limit = st.selectbox(
+                "Rows per page",
+                options=[50, 100, 250, 500, 1000],
+                index=1,
+                help="Number of rows to display"
+            )
+        
+        # Refresh button
+        col1, col2 = st.columns([1, 5])
+        with col1:
+            if st.button("🔄 Refresh", use_container_width=True):
+                clear_raw_data_cache()
+                st.rerun(scope="fragment")
+        
+        st.markdown("---")
+        
+        # Get raw data with filters
+        raw_data_args = dict(
+            tpa_filter=tuple(sorted(tpa_filter)) if tpa_filter else None,
+            file_filter=tuple(sorted(file_filter)) if file_filter else None,
+            limit=limit,
+            offset=0
+        )
+        raw_data_table = get_raw_data_by_filters(session, database, schema, **raw_data_args)
+        
+        if raw_data_table.num_rows > 0:
+            st.markdown(f"**Showing {raw_data_table.num_rows} rows** (limited to {limit} per page)")
+            
+            # Build the display table column-wise in Arrow (no pandas round-trip)
+            display_table = raw_data_table
+            
+            # Format file size
+            if 'file_size' in display_table.column_names:
+                file_size_kb = pc.round(pc.divide(pc.cast(display_table['file_size'], pa.float64()), 1024), 2)
+                display_table = display_table.append_column('file_size_kb', file_size_kb)
+            
+            # Select columns to display (only those that exist) and rename them
+            display_columns = ['raw_id', 'file_name', 'tpa', 'file_row_number', 'raw_data', 'load_timestamp', 'file_size_kb']
+            display_columns = [col for col in display_columns if col in display_table.column_names]
+            display_table = display_table.select(display_columns).rename_columns([RAW_DATA_DISPLAY_NAMES[col] for col in display_columns])
+            
+            # Display data table
+            st.dataframe(
+                display_table,
+                use_container_width=True,
+                hide_index=True,
+                column_config=RAW_DATA_COLUMN_CONFIG,
+                height=600
+            )
+            
+            # Download option
+            st.download_button(
+                label="📥 Download as CSV",
+                data=get_raw_data_csv(session, database, schema, **raw_data_args),
+                file_name=f"raw_data_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+            
+            # Show sample data expansion
+            with st.expander("🔍 View Sample Row Details"):
+                sample_row = raw_data_table.slice(0, 1).to_pylist()[0]
+                st.json(sample_row)
+        else:
+            st.info("No data found matching the selected filters")
+    else:
+        st.info("📭 No data in RAW_DATA_TABLE")
+
+def clear_task_cache():
+    """Clear cached task status, execution history and runtime statistics"""
+    get_all_tasks_status.clear()
+    get_task_history.clear()
+    get_task_runtime_stats.clear()
+
+def notify_bulk_task_result(success_count, total, verb):
+    """Show the outcome of a bulk task action as a toast"""
+    if total == 0:
+        st.toast(f"✓ All tasks already {verb}")
+    elif success_count == total:
+        st.toast(f"✓ All {success_count} tasks {verb}")
+    else:
+        st.toast(f"⚠️ {success_count}/{total} tasks {verb}")
+
+def resume_all_tasks(database, schema, root_tasks, child_tasks):
+    """Button callback: resume the given suspended tasks, child tasks before their roots"""
+    success_count = run_task_action(resume_task, session, database, schema, child_tasks)
+    success_count += run_task_action(resume_task, session, database, schema, root_tasks)
+    notify_bulk_task_result(success_count, len(root_tasks) + len(child_tasks), "resumed")
+    # Nothing changed state, so the cached task status is still accurate
+    if success_count:
+        get_all_tasks_status.clear()
+
+def suspend_all_tasks(database, schema, root_tasks, child_tasks):
+    """Button callback: suspend the given started tasks, root tasks before their children"""
+    success_count = run_task_action(suspend_task, session, database, schema, root_tasks)
+    success_count += run_task_action(suspend_task, session, database, schema, child_tasks)
+    notify_bulk_task_result(success_count, len(root_tasks) + len(child_tasks), "suspended")
+    if success_count:
+        get_all_tasks_status.clear()
+
+def execute_discovery_now(database, schema, config):
+    """Button callback: execute the discovery task immediately"""
+    success, message = execute_discovery_task(session, database, schema, config)
+    if success:
+        st.toast("✓ Discovery task executed - files will be processed shortly")
+        get_all_tasks_status.clear()
+    else:
+        st.toast(f"❌ {message}")
+
+# Task states refresh on their own at the task status cache TTL - faster polling would only hit the cache
+@st.fragment(run_every=TASK_STATUS_REFRESH_SECONDS)
+def render_task_management(database, schema):
+    """Task Management page body (a fragment, so task actions and auto-refresh only rerun this page)"""
+    st.subheader("Task Management & Control")
+    
+    st.button("🔄 Refresh Task Status", use_container_width=True, on_click=clear_task_cache)
+    
+    if session:
+        # Get task configuration
+        config = load_config_from_stage(session)
+        task_names = [
+            config.get('DISCOVER_TASK_NAME', 'discover_files_task'),
+            config.get('PROCESS_TASK_NAME', 'process_files_task'),
+            config.get('MOVE_SUCCESS_TASK_NAME', 'move_successful_files_task'),
+            config.get('MOVE_FAILED_TASK_NAME', 'move_failed_files_task'),
+            'reprocess_error_files_task',
+            'archive_old_files_task'
+        ]
+        
+        # Tasks that can be executed manually (no dependencies or independent)
+        executable_tasks = [
+            config.get('DISCOVER_TASK_NAME', 'discover_files_task').upper(),
+            'REPROCESS_ERROR_FILES_TASK',
+            'ARCHIVE_OLD_FILES_TASK'
+        ]
+        
+        # Get all tasks status
+        tasks_df = get_all_tasks_status(session, database, schema)
+        
+        if not tasks_df.empty:
+            # Debug: Show available columns if 'name' column is missing
+            if 'name' not in tasks_df.columns:
+                st.error(f"⚠️ Unexpected column names in task data. Found columns: {list(tasks_df.columns)}")
+                st.info("Please report this issue. Expected 'name' column but found different columns.")
+                return
+            
+            # Filter to only our pipeline tasks (case-insensitive comparison)
+            # A plain set lookup per row beats the .str accessor for the handful of tasks in a schema
+            task_names_upper = frozenset(name.upper() for name in task_names)
+            pipeline_tasks = tasks_df[[name.upper() in task_names_upper for name in tasks_df['name']]]
+            
+            if not pipeline_tasks.empty:
+                st.markdown("### Pipeline Tasks Overview")
+                
+                # Fetch recent history and runtime statistics for all pipeline tasks at once, then split per task
+                pipeline_task_names = tuple(sorted(pipeline_tasks['name'].str.upper()))
+                all_history_df = get_task_history(
+                    session, database, schema,
+                    pipeline_task_names,
+                    limit=TASK_HISTORY_ROWS_PER_TASK
+                )
+                runtime_stats_by_task = get_task_runtime_stats(session, database, schema, pipeline_task_names)
+                history_by_task = (
+                    {name: group for name, group in all_history_df.groupby('name')}
+                    if not all_history_df.empty else {}
+                )
+                
+                # Task order, icon and whether it can be executed manually, keyed by uppercased task name
+                task_order = {
+                    config.get('DISCOVER_TASK_NAME', 'discover_files_task').upper(): ('1️⃣', 'Discover Files', True),
+                    config.get('PROCESS_TASK_NAME', 'process_files_task').upper(): ('2️⃣', 'Process Files', False),
+                    config.get('MOVE_SUCCESS_TASK_NAME', 'move_successful_files_task').upper(): ('3️⃣', 'Move Successful', False),
+                    config.get('MOVE_FAILED_TASK_NAME', 'move_failed_files_task').upper(): ('4️⃣', 'Move Failed', False),
+                    'REPROCESS_ERROR_FILES_TASK': ('🔄', 'Reprocess Error Files', True),
+                    'ARCHIVE_OLD_FILES_TASK': ('📦', 'Archive Old Files', True)
+                }
+                
+                # Display task cards
+                for idx, task_row in enumerate(pipeline_tasks.to_dict('records')):
+                    task_name = task_row['name']
+                    task_state = task_row['state']
+                    
+                    # Determine task order and icon (case-insensitive matching)
+                    icon, display_name, can_execute = task_order.get(task_name.upper(), ('⚙️', task_name, False))
+                    
+                    # Only expand the first task by default
+                    is_expanded = (idx == 0)
+                    
+                    # Create expandable section for each task
+                    with st.expander(f"{icon} **{display_name}** - Status: **{task_state}**", expanded=is_expanded):
+                        col1, col2 = st.columns([3, 2])
+                        
+                        with col1:
+                            # Compact display using columns
+                            info_col1, info_col2 = st.columns(2)
+                            with info_col1:
+                                st.text(f"Task Name: {task_name}")
+                                st.text(f"State: {task_state}")
+                            with info_col2:
+                                st.text(f"Schedule: {task_row.get('schedule', 'N/A')}")
+                                st.text(f"Warehouse: {task_row.get('warehouse', 'N/A')}")
+                            
+                            # Show predecessor if exists
+                            if 'predecessors' in task_row and task_row['predecessors']:
+                                st.text(f"Depends On: {task_row['predecessors']}")
+                        
+                        with col2:
+                            st.markdown("**Actions:**")
+                            
+                            # Process Now button - only for executable tasks
+                            if can_execute:
+                                if st.button(f"▶️ Execute Now", key=f"exec_{task_name}", use_container_width=True):
+                                    with st.spinner(f"Executing {task_name}..."):
+                                        success, message = execute_task(session, database, schema, task_name)
+                                        if success:
+                                            st.toast(f"✓ {task_name}: {message}")
+                                            get_all_tasks_status.clear()
+                                            st.rerun(scope="fragment")
+                                        else:
+                                            st.error(message)
+                            else:
+                                st.info("⚠️ This task has dependencies and runs automatically after its predecessor completes.")
+                            
+                            # Resume/Suspend buttons
+                            if task_state == 'suspended':
+                                if st.button(f"▶️ Resume", key=f"resume_{task_name}", use_container_width=True):
+                                    with st.spinner(f"Resuming {task_name}..."):
+                                        success, message = resume_task(session, database, schema, task_name)
+                                        if success:
+                                            st.success(message)
+                                            get_all_tasks_status.clear()
+                                            st.rerun(scope="fragment")
+                                        else:
+                                            st.error(message)
+                            elif task_state == 'started':
+                                if st.button(f"⏸️ Suspend", key=f"suspend_{task_name}", use_container_width=True):
+                                    with st.spinner(f"Suspending {task_name}..."):
+                                        success, message = suspend_task(session, database, schema, task_name)
+                                        if success:
+                                            st.success(message)
+                                            get_all_tasks_status.clear()
+                                            st.rerun(scope="fragment")
+                                        else:
+                                            st.error(message)
+                        
+                        # Show recent task history (more compact)
+                        st.markdown("---")
+                        st.markdown("**Recent Executions (Last 24 hours):**")
+                        st.caption("⏱️ Task history has up to 45 min latency")
+                        
+                        history_df = history_by_task.get(task_name.upper(), pd.DataFrame())
+                        
+                        if not history_df.empty:
+                            # Show runtime statistics (compact) - aggregated over the whole window in Snowflake
+                            runtime_stats = runtime_stats_by_task.get(task_name.upper())
+                            if runtime_stats and runtime_stats['total_runs']:
+                                col1, col2, col3, col4 = st.columns(4)
+                                with col1:
+                                    st.metric("Avg Runtime", f"{float(runtime_stats['avg_runtime']):.2f}s", label_visibility="visible")
+                                with col2:
+                                    st.metric("Min Runtime", f"{float(runtime_stats['min_runtime']):.2f}s", label_visibility="visible")
+                                with col3:
+                                    st.metric("Max Runtime", f"{float(runtime_stats['max_runtime']):.2f}s", label_visibility="visible")
+                                with col4:
+                                    st.metric("Total Runs", runtime_stats['total_runs'], label_visibility="visible")
+                            
+                            # Runtime in seconds is computed by the history query; column_order picks
+                            # and orders the visible columns without copying the frame
+                            st.dataframe(
+                                history_df,
+                                use_container_width=True,
+                                hide_index=True,
+                                height=200,  # Compact height
+                                column_order=TASK_HISTORY_COLUMNS,
+                                column_config=TASK_HISTORY_COLUMN_CONFIG
+                            )
+                        else:
+                            st.info("No execution history in the last 24 hours")
+                
+                # Bulk actions
+                st.markdown("---")
+                st.markdown("### Bulk Actions")
+                
+                col1, col2, col3 = st.columns(3)
+                
+                # Child tasks can only be altered while their root is suspended, so roots are
+                # resumed last and suspended first; tasks within each group run concurrently
+                root_tasks = [name for name in task_names if name.upper() in executable_tasks]
+                child_tasks = [name for name in task_names if name.upper() not in executable_tasks]
+                
+                # Only tasks not already in the target state are altered (states from the cached task status)
+                task_states = dict(zip(pipeline_tasks['name'].str.upper(), pipeline_tasks['state']))
+                def tasks_in_state(names, state):
+                    return [name for name in names if task_states.get(name.upper()) == state]
+                
+                # Bulk actions run as callbacks, so the rerun that follows the click already shows the new states
+                with col1:
+                    st.button(
+                        "▶️ Resume All Tasks",
+                        type="secondary",
+                        use_container_width=True,
+                        on_click=resume_all_tasks,
+                        args=(database, schema, tasks_in_state(root_tasks, 'suspended'), tasks_in_state(child_tasks, 'suspended'))
+                    )
+                
+                with col2:
+                    st.button(
+                        "⏸️ Suspend All Tasks",
+                        type="secondary",
+                        use_container_width=True,
+                        on_click=suspend_all_tasks,
+                        args=(database, schema, tasks_in_state(root_tasks, 'started'), tasks_in_state(child_tasks, 'started'))
+                    )
+                
+                with col3:
+                    st.button(
+                        "🔄 Execute Discovery Now",
+                        type="primary",
+                        use_container_width=True,
+                        on_click=execute_discovery_now,
+                        args=(database, schema, config)
+                    )
+                
+            else:
+                st.warning("⚠️ No pipeline tasks found in schema")
+        else:
+            st.error("❌ Unable to retrieve task information")
 
 def main():
     # Get Snowflake session
@@ -599,6 +1523,10 @@ def main():
         # Load config from stage (default.config or custom.config)
         config = load_config_from_stage(session)
         
+        if st.button("🔄 Reload config", use_container_width=True, help="Re-read custom.config/default.config from CONFIG_STAGE"):
+            load_config_from_stage.clear()
+            st.rerun()
+        
         # Display loaded configuration (read-only)
         st.subheader("Pipeline Configuration")
         database = config.get('DATABASE_NAME', 'db_ingest_pipeline')
@@ -621,6 +1549,12 @@ def main():
         
         st.divider()
         
+        if st.button("🔄 Refresh catalog", use_container_width=True, help="Reload stage listings, processing status, raw data and task status"):
+            clear_catalog_cache()
+            st.rerun()
+        
+        st.divider()
+        
         # Connection info
         st.subheader("🔌 Connection Status")
         st.success("✓ Connected to Snowflake")
@@ -628,8 +1562,7 @@ def main():
         # Show current context
         with st.expander("View Session Info"):
             try:
-                current_user = session.sql("SELECT CURRENT_USER()").collect()[0][0]
-                current_role = session.sql("SELECT CURRENT_ROLE()").collect()[0][0]
+                current_user, current_role = get_session_context(session, session.session_id)
                 st.text(f"User: {current_user}")
                 st.text(f"Role: {current_role}")
                 st.text(f"Database: {database}")
@@ -707,32 +1640,51 @@ def main():
                 success_count = 0
                 failed_count = 0
                 
-                for idx, file in enumerate(uploaded_files):
-                    # Validate file
-                    is_valid, msg = validate_file(file)
+                # Validate files up front so invalid ones never enter the upload pool
+                validations = [(file, *validate_file(file)) for file in uploaded_files]
+                valid_files = [file for file, is_valid, _ in validations if is_valid]
+                for file, is_valid, msg in validations:
                     if not is_valid:
                         status_placeholder.error(f"❌ {file.name}: {msg}")
                         failed_count += 1
-                        continue
-                    
-                    # Upload file with TPA folder
-                    status_placeholder.info(f"⏳ Uploading {file.name} to {tpa_folder}/...")
-                    success, message = upload_file_to_stage(
-                        session,
-                        file,
-                        f"{database}.{schema}.{src_stage}",
-                        tpa_folder=tpa_folder
-                    )
-                    
-                    if success:
-                        status_placeholder.success(f"✅ {file.name}: {message} (TPA: {tpa_folder})")
-                        success_count += 1
-                    else:
-                        status_placeholder.error(f"❌ {file.name}: {message}")
-                        failed_count += 1
+                
+                completed = failed_count
+                progress_bar.progress(completed / len(uploaded_files))
+                
+                compress_csv = config.get('AUTO_COMPRESS_CSV', 'true').lower() == 'true'
+                
+                if valid_files:
+                    status_placeholder.info(f"⏳ Uploading {len(valid_files)} file(s) to {tpa_folder}/...")
                     
-                    # Update progress
-                    progress_bar.progress((idx + 1) / len(uploaded_files))
+                    # Upload files concurrently - each PUT is network bound, so threads scale well.
+                    # Results are consumed on the script thread, so the counters need no locking.
+                    with ThreadPoolExecutor(max_workers=min(MAX_UPLOAD_WORKERS, len(valid_files))) as executor:
+                        futures = {
+                            executor.submit(
+                                upload_file_to_stage,
+                                session,
+                                file,
+                                f"{database}.{schema}.{src_stage}",
+                                tpa_folder=tpa_folder,
+                                compress_csv=compress_csv
+                            ): file
+                            for file in valid_files
+                        }
+                        
+                        for future in as_completed(futures):
+                            file = futures[future]
+                            success, message = future.result()
+                            
+                            if success:
+                                status_placeholder.success(f"✅ {file.name}: {message} (TPA: {tpa_folder})")
+                                success_count += 1
+                            else:
+                                status_placeholder.error(f"❌ {file.name}: {message}")
+                                failed_count += 1
+                            
+                            # Update progress
+                            completed += 1
+                            progress_bar.progress(completed / len(uploaded_files))
                 
                 # Final summary
                 st.divider()
@@ -745,6 +1697,7 @@ def main():
                     st.metric("Failed", failed_count)
                 
                 if success_count > 0:
+                    get_stage_files.clear()
                     st.success(f"🎉 Successfully uploaded {success_count} file(s)!")
                     
                     # Trigger immediate processing if checkbox is checked
@@ -752,30 +1705,20 @@ def main():
                         st.markdown("---")
                         st.info("🔄 Triggering file discovery and processing...")
                         
-                        try:
-                            # Get discovery task name from config
-                            discover_task = config.get('DISCOVER_TASK_NAME', 'discover_files_task')
-                            
-                            # Execute discovery task
-                            status_placeholder.info(f"⏳ Executing {discover_task}...")
-                            success, message = execute_task(session, database, schema, discover_task)
-                            
-                            if success:
-                                status_placeholder.success(f"✅ Discovery task executed successfully!")
-                                st.success("🎯 Files are now being discovered and will be processed shortly")
-                                
-                                # Show link to processing status
-                                st.info("💡 **Next Steps:**\n"
-                                       "- Go to the **📊 Processing Status** tab to monitor progress\n"
-                                       "- Processing typically takes 1-2 minutes per file\n"
-                                       "- Check **🚨 Error Files** tab if any files fail")
-                            else:
-                                status_placeholder.warning(f"⚠️ Could not execute discovery task: {message}")
-                                schedule_minutes = config.get('DISCOVER_TASK_SCHEDULE_MINUTES', '5')
-                                st.info(f"Files will be processed on next scheduled run (every {schedule_minutes} minutes)")
+                        status_placeholder.info("⏳ Executing discovery task...")
+                        success, message = execute_discovery_task(session, database, schema, config)
                         
-                        except Exception as e:
-                            st.error(f"❌ Error triggering discovery: {str(e)}")
+                        if success:
+                            status_placeholder.success(f"✅ Discovery task executed successfully!")
+                            st.success("🎯 Files are now being discovered and will be processed shortly")
+                            
+                            # Show link to processing status
+                            st.info("💡 **Next Steps:**\n"
+                                   "- Go to the **📊 Processing Status** tab to monitor progress\n"
+                                   "- Processing typically takes 1-2 minutes per file\n"
+                                   "- Check **🚨 Error Files** tab if any files fail")
+                        else:
+                            status_placeholder.warning(f"⚠️ Could not execute discovery task: {message}")
                             schedule_minutes = config.get('DISCOVER_TASK_SCHEDULE_MINUTES', '5')
                             st.info(f"Files will be processed on next scheduled run (every {schedule_minutes} minutes)")
                     else:
@@ -784,244 +1727,7 @@ def main():
     
     # Tab 2: Processing Status
     if page == "📊 Processing Status":
-        st.subheader("Processing Status")
-        st.markdown("View all files that have been processed through the pipeline with their status and statistics.")
-        
-        # Manual refresh button
-        if st.button("🔄 Refresh Now", key="refresh_now_top"):
-            st.rerun()
-        
-        # Get statistics (this will refresh each time the tab is rendered)
-        # Filter by selected TPA
-        stats_df = get_processed_files_stats(session, database, schema, st.session_state.selected_tpa)
-        
-        if not stats_df.empty:
-            # Display summary metrics
-            col1, col2, col3, col4, col5 = st.columns(5)
-            
-            # Safely extract values, handling NaN
-            total = int(stats_df['total_files'].iloc[0]) if pd.notna(stats_df['total_files'].iloc[0]) else 0
-            successful = int(stats_df['successful_files'].iloc[0]) if pd.notna(stats_df['successful_files'].iloc[0]) else 0
-            failed = int(stats_df['failed_files'].iloc[0]) if pd.notna(stats_df['failed_files'].iloc[0]) else 0
-            processing = int(stats_df['processing_files'].iloc[0]) if pd.notna(stats_df['processing_files'].iloc[0]) else 0
-            pending = int(stats_df['pending_files'].iloc[0]) if pd.notna(stats_df['pending_files'].iloc[0]) else 0
-            total_rows = int(stats_df['total_rows_processed'].iloc[0]) if pd.notna(stats_df['total_rows_processed'].iloc[0]) else 0
-            
-            with col1:
-                st.metric("Total Files", total)
-            with col2:
-                st.metric("✅ Success", successful, delta=f"{(successful/total*100):.1f}%" if total > 0 else "0%")
-            with col3:
-                st.metric("❌ Failed", failed, delta=f"{(failed/total*100):.1f}%" if total > 0 else "0%", delta_color="inverse")
-            with col4:
-                st.metric("⏳ Processing", processing)
-            with col5:
-                st.metric("📊 Total Rows", f"{total_rows:,}")
-        
-        st.markdown("---")
-        
-        # Get all processed files first
-        files_df = get_processed_files_summary(session, database, schema)
-        
-        if not files_df.empty:
-            # Filter by selected TPA from header
-            if st.session_state.selected_tpa:
-                files_df = files_df[files_df['tpa'] == st.session_state.selected_tpa]
-            
-            # Filter options (Status and File Type only - TPA is in header)
-            col1, col2 = st.columns([3, 3])
-            
-            with col1:
-                status_filter = st.multiselect(
-                    "Filter by Status",
-                    options=["SUCCESS", "FAILED", "PROCESSING", "PENDING"],
-                    default=["SUCCESS", "FAILED", "PROCESSING", "PENDING"]
-                )
-            
-            with col2:
-                file_type_filter = st.multiselect(
-                    "Filter by File Type",
-                    options=["CSV", "EXCEL"],
-                    default=["CSV", "EXCEL"]
-                )
-            
-            # Apply filters
-            if status_filter:
-                files_df = files_df[files_df['status'].isin(status_filter)]
-            if file_type_filter:
-                files_df = files_df[files_df['file_type'].isin(file_type_filter)]
-            
-            # Display count
-            st.markdown(f"**Showing {len(files_df)} files**")
-            
-            # Display files table
-            if len(files_df) > 0:
-                # Format the dataframe for display
-                display_df = files_df.copy()
-                
-                # Add status emoji
-                status_emoji = {
-                    'SUCCESS': '✅',
-                    'FAILED': '❌',
-                    'PROCESSING': '⏳',
-                    'PENDING': '⏸️'
-                }
-                display_df['status'] = display_df['status'].apply(lambda x: f"{status_emoji.get(x, '')} {x}")
-                
-                # Format timestamps
-                if 'discovered_timestamp' in display_df.columns:
-                    display_df['discovered_timestamp'] = pd.to_datetime(display_df['discovered_timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-                if 'processed_timestamp' in display_df.columns:
-                    display_df['processed_timestamp'] = pd.to_datetime(display_df['processed_timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Rename columns for display
-                display_df = display_df.rename(columns={
-                    'file_name': 'File Name',
-                    'file_type': 'Type',
-                    'status': 'Status',
-                    'tpa': 'TPA',
-                    'discovered_timestamp': 'Discovered',
-                    'processed_timestamp': 'Processed',
-                    'process_result': 'Result',
-                    'error_message': 'Error'
-                })
-                
-                # Reorder columns to show TPA after Type
-                column_order = ['File Name', 'Type', 'TPA', 'Status', 'Discovered', 'Processed', 'Result', 'Error']
-                # Only include columns that exist in the dataframe
-                column_order = [col for col in column_order if col in display_df.columns]
-                display_df = display_df[column_order]
-                
-                # Display with expandable error messages
-                st.dataframe(
-                    display_df,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "Type": st.column_config.TextColumn(width="small"),
-                        "TPA": st.column_config.TextColumn(width="small"),
-                        "Status": st.column_config.TextColumn(width="small"),
-                        "Result": st.column_config.TextColumn(width="medium"),
-                        "Error": st.column_config.TextColumn(width="large")
-                    }
-                )
-                
-                # Download option
-                csv = files_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name=f"processed_files_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                
-                # Reprocess failed files section
-                failed_files = files_df[files_df['status'] == 'FAILED']
-                if not failed_files.empty:
-                    st.markdown("---")
-                    st.markdown("### 🔄 Reprocess Failed Files")
-                    st.markdown(f"Found **{len(failed_files)}** failed file(s) that can be reprocessed")
-                    
-                    # Select file to reprocess
-                    failed_file_names = failed_files['file_name'].tolist()
-                    
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        selected_failed_file = st.selectbox(
-                            "Select file to reprocess:",
-                            options=failed_file_names,
-                            key="reprocess_failed_file_select"
-                        )
-                    
-                    with col2:
-                        st.markdown("<br>", unsafe_allow_html=True)  # Spacer for alignment
-                        if st.button("🔄 Reprocess File", type="primary", use_container_width=True, key="reprocess_from_status"):
-                            if selected_failed_file:
-                                with st.spinner(f"Reprocessing {selected_failed_file}..."):
-                                    try:
-                                        # Call the reprocess procedure
-                                        reprocess_query = f"""
-                                            CALL {database}.{schema}.reprocess_error_file('{selected_failed_file}')
-                                        """
-                                        result = session.sql(reprocess_query).collect()
-                                        
-                                        if result and len(result) > 0:
-                                            message = result[0][0]
-                                            if "SUCCESS" in message:
-                                                st.success(f"✅ {message}")
-                                                
-                                                # Trigger discovery if checkbox is checked
-                                                if st.checkbox("🚀 Start Discovery Now", value=True, key="trigger_discovery_after_reprocess"):
-                                                    try:
-                                                        discover_task = config.get('DISCOVER_TASK_NAME', 'discover_files_task')
-                                                        success, msg = execute_task(session, database, schema, discover_task)
-                                                        if success:
-                                                            st.success("✅ Discovery task executed - file will be reprocessed shortly")
-                                                        else:
-                                                            st.warning(f"⚠️ Could not execute discovery: {msg}")
-                                                            st.info("File has been moved to source stage and will be picked up on next scheduled run")
-                                                    except Exception as e:
-                                                        st.warning(f"⚠️ Could not trigger discovery: {str(e)}")
-                                                        st.info("File has been moved to source stage and will be picked up on next scheduled run")
-                                                else:
-                                                    schedule_minutes = config.get('DISCOVER_TASK_SCHEDULE_MINUTES', '5')
-                                                    st.info(f"File will be processed on next scheduled run (every {schedule_minutes} minutes)")
-                                                
-                                                time.sleep(2)
-                                                st.rerun()
-                                            else:
-                                                st.error(f"❌ {message}")
-                                    except Exception as e:
-                                        st.error(f"❌ Error reprocessing file: {str(e)}")
-                    
-                    # Batch reprocess option
-                    st.markdown("---")
-                    st.markdown("#### 🔄 Batch Reprocess All Failed Files")
-                    st.warning(f"⚠️ This will reprocess all {len(failed_files)} failed file(s)")
-                    
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        batch_trigger_discovery = st.checkbox(
-                            "🚀 Start Discovery After Batch Reprocess",
-                            value=True,
-                            key="batch_trigger_discovery"
-                        )
-                    
-                    with col2:
-                        if st.button("🔄 Reprocess All", type="primary", use_container_width=True, key="batch_reprocess_from_status"):
-                            with st.spinner(f"Reprocessing {len(failed_files)} files..."):
-                                try:
-                                    reprocess_all_query = f"""
-                                        CALL {database}.{schema}.reprocess_all_error_files()
-                                    """
-                                    result = session.sql(reprocess_all_query).collect()
-                                    
-                                    if result and len(result) > 0:
-                                        message = result[0][0]
-                                        st.success(f"✅ {message}")
-                                        
-                                        # Trigger discovery if checkbox is checked
-                                        if batch_trigger_discovery:
-                                            try:
-                                                discover_task = config.get('DISCOVER_TASK_NAME', 'discover_files_task')
-                                                success, msg = execute_task(session, database, schema, discover_task)
-                                                if success:
-                                                    st.success("✅ Discovery task executed - files will be reprocessed shortly")
-                                                else:
-                                                    st.warning(f"⚠️ Could not execute discovery: {msg}")
-                                            except Exception as e:
-                                                st.warning(f"⚠️ Could not trigger discovery: {str(e)}")
-                                        
-                                        time.sleep(2)
-                                        st.rerun()
-                                except Exception as e:
-                                    st.error(f"❌ Error reprocessing files: {str(e)}")
-            else:
-                st.info("No files match the selected filters")
-        else:
-            st.info("No processed files found")
+        render_processing_status(database, schema, config)
     
     # Tab 4: Stage Files
     # Tab 3: Stage Files
@@ -1044,6 +1750,7 @@ def main():
             st.write("")  # Spacer
             st.write("")  # Spacer
             if st.button("🔄 Refresh", key="refresh_stage_files", use_container_width=True):
+                get_stage_files.clear()
                 st.rerun()
         
         if session:
@@ -1058,440 +1765,18 @@ def main():
                     stage_df,
                     use_container_width=True,
                     hide_index=True,
-                    column_config={
-                        "name": "File Path",
-                        "size": st.column_config.NumberColumn(
-                            "Size (bytes)",
-                            format="%d"
-                        ),
-                        "md5": "MD5 Hash",
-                        "last_modified": st.column_config.DatetimeColumn(
-                            "Last Modified",
-                            format="YYYY-MM-DD HH:mm:ss"
-                        )
-                    }
+                    column_config=STAGE_FILES_COLUMN_CONFIG
                 )
             else:
                 st.info(f"📭 No files in {selected_stage_label}")
     
     # Tab 4: Raw Data Viewer
     if page == "📋 Raw Data Viewer":
-        st.subheader("Raw Data Viewer")
-        st.markdown("View the contents of the RAW_DATA_TABLE with filtering and pagination.")
-        
-        # Get summary statistics
-        summary_df = get_raw_data_summary(session, database, schema)
-        
-        if not summary_df.empty:
-            # Display summary metrics
-            col1, col2, col3, col4, col5 = st.columns(5)
-            
-            total_rows = int(summary_df['total_rows'].iloc[0]) if pd.notna(summary_df['total_rows'].iloc[0]) else 0
-            unique_files = int(summary_df['unique_files'].iloc[0]) if pd.notna(summary_df['unique_files'].iloc[0]) else 0
-            unique_tpas = int(summary_df['unique_tpas'].iloc[0]) if pd.notna(summary_df['unique_tpas'].iloc[0]) else 0
-            
-            with col1:
-                st.metric("Total Rows", f"{total_rows:,}")
-            with col2:
-                st.metric("Unique Files", unique_files)
-            with col3:
-                st.metric("Unique TPAs", unique_tpas)
-            with col4:
-                if pd.notna(summary_df['earliest_load'].iloc[0]):
-                    earliest = pd.to_datetime(summary_df['earliest_load'].iloc[0]).strftime('%Y-%m-%d')
-                    st.metric("Earliest Load", earliest)
-                else:
-                    st.metric("Earliest Load", "N/A")
-            with col5:
-                if pd.notna(summary_df['latest_load'].iloc[0]):
-                    latest = pd.to_datetime(summary_df['latest_load'].iloc[0]).strftime('%Y-%m-%d')
-                    st.metric("Latest Load", latest)
-                else:
-                    st.metric("Latest Load", "N/A")
-        
-        st.markdown("---")
-        
-        # Get files and TPAs for filter options
-        files_tpas_df = get_raw_data_files_and_tpas(session, database, schema)
-        
-        if not files_tpas_df.empty:
-            # Filter options
-            col1, col2, col3 = st.columns([2, 2, 1])
-            
-            with col1:
-                # TPA filter - single select with "All TPAs" option
-                tpa_options = sorted(files_tpas_df['tpa'].unique().tolist())
-                tpa_options_with_all = ["All TPAs"] + tpa_options
-                
-                selected_tpa = st.selectbox(
-                    "Filter by TPA",
-                    options=tpa_options_with_all,
-                    index=0,
-                    help="Select a TPA to view data from that provider"
-                )
-                
-                # Convert selection to filter list
-                if selected_tpa == "All TPAs":
-                    tpa_filter = None
-                else:
-                    tpa_filter = [selected_tpa]
-            
-            with col2:
-                # File filter (only show files for selected TPA)
-                if tpa_filter:
-                    file_options = sorted(files_tpas_df[files_tpas_df['tpa'].isin(tpa_filter)]['file_name'].unique().tolist())
-                else:
-                    file_options = sorted(files_tpas_df['file_name'].unique().tolist())
-                
-                file_filter = st.multiselect(
-                    "Filter by File",
-                    options=file_options,
-                    default=file_options[:3] if len(file_options) > 3 else file_options,
-                    help="Select one or more files to view"
-                )
-            
-            with col3:
-                # Limit/pagination
-                limit = st.selectbox(
-                    "Rows per page",
-                    options=[50, 100, 250, 500, 1000],
-                    index=1,
-                    help="Number of rows to display"
-                )
-            
-            # Refresh button
-            col1, col2 = st.columns([1, 5])
-            with col1:
-                if st.button("🔄 Refresh", use_container_width=True):
-                    st.rerun()
-            
-            st.markdown("---")
-            
-            # Get raw data with filters
-            raw_data_df = get_raw_data_by_filters(
-                session, 
-                database, 
-                schema, 
-                tpa_filter=tpa_filter if tpa_filter else None,
-                file_filter=file_filter if file_filter else None,
-                limit=limit,
-                offset=0
-            )
-            
-            if not raw_data_df.empty:
-                st.markdown(f"**Showing {len(raw_data_df)} rows** (limited to {limit} per page)")
-                
-                # Format the dataframe for display
-                display_df = raw_data_df.copy()
-                
-                # Format timestamps
-                if 'load_timestamp' in display_df.columns:
-                    display_df['load_timestamp'] = pd.to_datetime(display_df['load_timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
-                if 'file_last_modified' in display_df.columns:
-                    display_df['file_last_modified'] = pd.to_datetime(display_df['file_last_modified']).dt.strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Format file size
-                if 'file_size' in display_df.columns:
-                    display_df['file_size_kb'] = (display_df['file_size'] / 1024).round(2)
-                
-                # Convert RAW_DATA (VARIANT) to string for display
-                if 'raw_data' in display_df.columns:
-                    display_df['raw_data'] = display_df['raw_data'].astype(str)
-                
-                # Rename columns for display
-                display_df = display_df.rename(columns={
-                    'raw_id': 'ID',
-                    'file_name': 'File Name',
-                    'tpa': 'TPA',
-                    'file_row_number': 'Row #',
-                    'raw_data': 'Data (JSON)',
-                    'load_timestamp': 'Loaded',
-                    'file_size_kb': 'File Size (KB)',
-                    'file_last_modified': 'File Modified'
-                })
-                
-                # Select columns to display
-                display_columns = ['ID', 'File Name', 'TPA', 'Row #', 'Data (JSON)', 'Loaded']
-                if 'File Size (KB)' in display_df.columns:
-                    display_columns.append('File Size (KB)')
-                
-                # Only include columns that exist
-                display_columns = [col for col in display_columns if col in display_df.columns]
-                display_df = display_df[display_columns]
-                
-                # Display data table
-                st.dataframe(
-                    display_df,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "ID": st.column_config.NumberColumn(width="small"),
-                        "File Name": st.column_config.TextColumn(width="medium"),
-                        "TPA": st.column_config.TextColumn(width="small"),
-                        "Row #": st.column_config.NumberColumn(width="small"),
-                        "Data (JSON)": st.column_config.TextColumn(width="large"),
-                        "Loaded": st.column_config.TextColumn(width="medium"),
-                        "File Size (KB)": st.column_config.NumberColumn(width="small", format="%.2f")
-                    },
-                    height=600
-                )
-                
-                # Download option
-                csv = raw_data_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download as CSV",
-                    data=csv,
-                    file_name=f"raw_data_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                
-                # Show sample data expansion
-                with st.expander("🔍 View Sample Row Details"):
-                    if len(raw_data_df) > 0:
-                        sample_row = raw_data_df.iloc[0]
-                        st.json(sample_row.to_dict())
-            else:
-                st.info("No data found matching the selected filters")
-        else:
-            st.info("📭 No data in RAW_DATA_TABLE")
+        render_raw_data_viewer(database, schema)
     
     # Tab 5: Task Management
-    # Tab 4: Task Management
     if page == "⚙️ Task Management":
-        st.subheader("Task Management & Control")
-        
-        if st.button("🔄 Refresh Task Status", use_container_width=True):
-            st.rerun()
-        
-        if session:
-            # Get task configuration
-            config = load_config_from_stage(session)
-            task_names = [
-                config.get('DISCOVER_TASK_NAME', 'discover_files_task'),
-                config.get('PROCESS_TASK_NAME', 'process_files_task'),
-                config.get('MOVE_SUCCESS_TASK_NAME', 'move_successful_files_task'),
-                config.get('MOVE_FAILED_TASK_NAME', 'move_failed_files_task'),
-                'reprocess_error_files_task',
-                'archive_old_files_task'
-            ]
-            
-            # Tasks that can be executed manually (no dependencies or independent)
-            executable_tasks = [
-                config.get('DISCOVER_TASK_NAME', 'discover_files_task').upper(),
-                'REPROCESS_ERROR_FILES_TASK',
-                'ARCHIVE_OLD_FILES_TASK'
-            ]
-            
-            # Get all tasks status
-            tasks_df = get_all_tasks_status(session, database, schema)
-            
-            if not tasks_df.empty:
-                # Debug: Show available columns if 'name' column is missing
-                if 'name' not in tasks_df.columns:
-                    st.error(f"⚠️ Unexpected column names in task data. Found columns: {list(tasks_df.columns)}")
-                    st.info("Please report this issue. Expected 'name' column but found different columns.")
-                    return
-                
-                # Filter to only our pipeline tasks (case-insensitive comparison)
-                # Convert both task names to uppercase for comparison
-                task_names_upper = [name.upper() for name in task_names]
-                pipeline_tasks = tasks_df[tasks_df['name'].str.upper().isin(task_names_upper)]
-                
-                if not pipeline_tasks.empty:
-                    st.markdown("### Pipeline Tasks Overview")
-                    
-                    # Display task cards
-                    for idx, task_row in pipeline_tasks.iterrows():
-                        task_name = task_row['name']
-                        task_state = task_row['state']
-                        
-                        # Determine task order and icon (case-insensitive matching)
-                        task_order = {
-                            config.get('DISCOVER_TASK_NAME', 'discover_files_task').upper(): ('1️⃣', 'Discover Files', True),
-                            config.get('PROCESS_TASK_NAME', 'process_files_task').upper(): ('2️⃣', 'Process Files', False),
-                            config.get('MOVE_SUCCESS_TASK_NAME', 'move_successful_files_task').upper(): ('3️⃣', 'Move Successful', False),
-                            config.get('MOVE_FAILED_TASK_NAME', 'move_failed_files_task').upper(): ('4️⃣', 'Move Failed', False),
-                            'REPROCESS_ERROR_FILES_TASK': ('🔄', 'Reprocess Error Files', True),
-                            'ARCHIVE_OLD_FILES_TASK': ('📦', 'Archive Old Files', True)
-                        }
-                        
-                        icon, display_name, can_execute = task_order.get(task_name.upper(), ('⚙️', task_name, False))
-                        
-                        # Only expand the first task by default
-                        is_expanded = (idx == 0)
-                        
-                        # Create expandable section for each task
-                        with st.expander(f"{icon} **{display_name}** - Status: **{task_state}**", expanded=is_expanded):
-                            col1, col2 = st.columns([3, 2])
-                            
-                            with col1:
-                                # Compact display using columns
-                                info_col1, info_col2 = st.columns(2)
-                                with info_col1:
-                                    st.text(f"Task Name: {task_name}")
-                                    st.text(f"State: {task_state}")
-                                with info_col2:
-                                    st.text(f"Schedule: {task_row.get('schedule', 'N/A')}")
-                                    st.text(f"Warehouse: {task_row.get('warehouse', 'N/A')}")
-                                
-                                # Show predecessor if exists
-                                if 'predecessors' in task_row and task_row['predecessors']:
-                                    st.text(f"Depends On: {task_row['predecessors']}")
-                            
-                            with col2:
-                                st.markdown("**Actions:**")
-                                
-                                # Process Now button - only for executable tasks
-                                if can_execute:
-                                    if st.button(f"▶️ Execute Now", key=f"exec_{task_name}", use_container_width=True):
-                                        with st.spinner(f"Executing {task_name}..."):
-                                            success, message = execute_task(session, database, schema, task_name)
-                                            if success:
-                                                st.success(message)
-                                                st.rerun()
-                                            else:
-                                                st.error(message)
-                                else:
-                                    st.info("⚠️ This task has dependencies and runs automatically after its predecessor completes.")
-                                
-                                # Resume/Suspend buttons
-                                if task_state == 'suspended':
-                                    if st.button(f"▶️ Resume", key=f"resume_{task_name}", use_container_width=True):
-                                        with st.spinner(f"Resuming {task_name}..."):
-                                            success, message = resume_task(session, database, schema, task_name)
-                                            if success:
-                                                st.success(message)
-                                                st.rerun()
-                                            else:
-                                                st.error(message)
-                                elif task_state == 'started':
-                                    if st.button(f"⏸️ Suspend", key=f"suspend_{task_name}", use_container_width=True):
-                                        with st.spinner(f"Suspending {task_name}..."):
-                                            success, message = suspend_task(session, database, schema, task_name)
-                                            if success:
-                                                st.success(message)
-                                                st.rerun()
-                                            else:
-                                                st.error(message)
-                            
-                            # Show recent task history (more compact)
-                            st.markdown("---")
-                            st.markdown("**Recent Executions (Last 24 hours):**")
-                            st.caption("⏱️ Task history has up to 45 min latency")
-                            
-                            history_df = get_task_history(session, database, schema, task_name, limit=5)
-                            
-                            if not history_df.empty:
-                                # Calculate runtime in seconds
-                                display_df = history_df[['state', 'scheduled_time', 'completed_time', 'error_message']].copy()
-                                
-                                # Add runtime column (in seconds)
-                                display_df['runtime_seconds'] = (
-                                    pd.to_datetime(display_df['completed_time']) - 
-                                    pd.to_datetime(display_df['scheduled_time'])
-                                ).dt.total_seconds()
-                                
-                                # Show runtime statistics (compact)
-                                valid_runtimes = display_df['runtime_seconds'].dropna()
-                                if len(valid_runtimes) > 0:
-                                    col1, col2, col3, col4 = st.columns(4)
-                                    with col1:
-                                        st.metric("Avg Runtime", f"{valid_runtimes.mean():.2f}s", label_visibility="visible")
-                                    with col2:
-                                        st.metric("Min Runtime", f"{valid_runtimes.min():.2f}s", label_visibility="visible")
-                                    with col3:
-                                        st.metric("Max Runtime", f"{valid_runtimes.max():.2f}s", label_visibility="visible")
-                                    with col4:
-                                        st.metric("Total Runs", len(valid_runtimes), label_visibility="visible")
-                                
-                                # Reorder columns to show runtime before error_message
-                                display_df = display_df[['state', 'scheduled_time', 'completed_time', 'runtime_seconds', 'error_message']]
-                                
-                                st.dataframe(
-                                    display_df,
-                                    use_container_width=True,
-                                    hide_index=True,
-                                    height=200,  # Compact height
-                                    column_config={
-                                        "state": st.column_config.TextColumn(
-                                            "Status",
-                                            width="small"
-                                        ),
-                                        "scheduled_time": st.column_config.DatetimeColumn(
-                                            "Scheduled",
-                                            format="MM/DD HH:mm:ss",
-                                            width="medium"
-                                        ),
-                                        "completed_time": st.column_config.DatetimeColumn(
-                                            "Completed",
-                                            format="MM/DD HH:mm:ss",
-                                            width="medium"
-                                        ),
-                                        "runtime_seconds": st.column_config.NumberColumn(
-                                            "Runtime (s)",
-                                            format="%.2f",
-                                            width="small"
-                                        ),
-                                        "error_message": st.column_config.TextColumn(
-                                            "Error",
-                                            width="medium"
-                                        )
-                                    }
-                                )
-                            else:
-                                st.info("No execution history in the last 24 hours")
-                    
-                    # Bulk actions
-                    st.markdown("---")
-                    st.markdown("### Bulk Actions")
-                    
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        if st.button("▶️ Resume All Tasks", type="secondary", use_container_width=True):
-                            with st.spinner("Resuming all tasks..."):
-                                success_count = 0
-                                for task_name in task_names:
-                                    success, _ = resume_task(session, database, schema, task_name)
-                                    if success:
-                                        success_count += 1
-                                
-                                if success_count == len(task_names):
-                                    st.success(f"✓ All {success_count} tasks resumed")
-                                else:
-                                    st.warning(f"⚠️ {success_count}/{len(task_names)} tasks resumed")
-                                st.rerun()
-                    
-                    with col2:
-                        if st.button("⏸️ Suspend All Tasks", type="secondary", use_container_width=True):
-                            with st.spinner("Suspending all tasks..."):
-                                success_count = 0
-                                for task_name in task_names:
-                                    success, _ = suspend_task(session, database, schema, task_name)
-                                    if success:
-                                        success_count += 1
-                                
-                                if success_count == len(task_names):
-                                    st.success(f"✓ All {success_count} tasks suspended")
-                                else:
-                                    st.warning(f"⚠️ {success_count}/{len(task_names)} tasks suspended")
-                                st.rerun()
-                    
-                    with col3:
-                        if st.button("🔄 Execute Discovery Now", type="primary", use_container_width=True):
-                            with st.spinner("Executing discovery task..."):
-                                discover_task = config.get('DISCOVER_TASK_NAME', 'discover_files_task')
-                                success, message = execute_task(session, database, schema, discover_task)
-                                if success:
-                                    st.success("✓ Discovery task executed - files will be processed shortly")
-                                    st.rerun()
-                                else:
-                                    st.error(message)
-                    
-                else:
-                    st.warning("⚠️ No pipeline tasks found in schema")
-            else:
-                st.error("❌ Unable to retrieve task information")
+        render_task_management(database, schema)
     
     # Footer
     st.divider()
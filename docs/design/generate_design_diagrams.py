@@ -3,13 +3,22 @@
 Generate Architecture Diagrams for System Design Document
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
-import numpy as np
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use('Agg')  # Headless: files only, skip GUI backend probing
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.patches import BoxStyle, FancyBboxPatch, FancyArrowPatch
+from matplotlib.collections import PatchCollection
 
 # Set style
-plt.style.use('seaborn-v0_8-darkgrid')
+matplotlib.style.use('seaborn-v0_8-darkgrid')
+# Pin the font so text layout doesn't walk the sans-serif fallback list, and keep SVG text as text
+matplotlib.rcParams['font.family'] = ['DejaVu Sans']
+matplotlib.rcParams['svg.fonttype'] = 'none'
 colors = {
     'snowflake': '#29B5E8',
     'bronze': '#CD7F32',
@@ -23,9 +32,57 @@ colors = {
     'border': '#34495E'
 }
 
-def create_high_level_architecture():
+# Shared box and arrow styles, built once instead of parsing "round,pad=..." per patch.
+# Arrows sit at zorder 2 so they stay above box collections added after them
+STEP_BOXSTYLE = BoxStyle("Round", pad=0.1)
+APP_BOXSTYLE = BoxStyle("Round", pad=0.2)
+LAYER_BOXSTYLE = BoxStyle("Round", pad=0.3)
+ACCOUNT_BOXSTYLE = BoxStyle("Round", pad=0.5)
+FLOW_ARROW_STYLE = dict(arrowstyle='->', mutation_scale=20, linewidth=2, color='black', zorder=2)
+ROLE_BOX_STYLE = dict(boxstyle=STEP_BOXSTYLE, edgecolor='black', linewidth=2.5, alpha=0.8)
+ROLE_ARROW_STYLE = dict(arrowstyle='->', mutation_scale=25, linewidth=2.5, color='black', zorder=2)
+
+# Resolution for the saved PNGs - 150 DPI is plenty for docs and rasterizes 4x fewer pixels than 300
+DIAGRAM_DPI = 150
+# Flat-colour diagrams compress well at a low zlib level; skip Pillow's extra optimize pass
+PNG_SAVE_OPTIONS = {'compress_level': 3, 'optimize': False}
+
+# Hash of this script, recorded in a local (gitignored) .hash sidecar next to each output.
+# Unlike mtimes it is unaffected by touches or copies, so a diagram is only re-rendered when
+# this script changes or its sidecar is missing
+with open(__file__, 'rb') as source_file:
+    SOURCE_HASH = hashlib.sha256(source_file.read()).hexdigest()
+
+def is_up_to_date(output_path):
+    """Check whether a diagram exists and was rendered by this exact version of the script"""
+    try:
+        with open(output_path + '.hash') as hash_file:
+            return os.path.exists(output_path) and hash_file.read().strip() == SOURCE_HASH
+    except OSError:
+        return False
+
+def draw_bullet_list(ax, x, y, items):
+    """Draw bullet items as one multi-line Text artist, first baseline at y and 4 data units apart"""
+    # linespacing 3.3 matches the 4-unit step at fontsize 8 on the 16x12 architecture canvas;
+    # a multi-line baseline anchor sits on the last line, so shift y down to it
+    ax.text(x, y - 4 * (len(items) - 1), '\n'.join(f'• {item}' for item in items),
+            fontsize=8, linespacing=3.3, color=colors['text'])
+
+def save_diagram(fig, output_path):
+    """Save a diagram - PNGs are rasterized at DIAGRAM_DPI, SVGs are written as vectors"""
+    # Every element is hand-placed on fixed axes, so no layout pass is needed; bbox_inches trims the margins
+    options = dict(bbox_inches='tight', facecolor='white', edgecolor='none')
+    if output_path.endswith('.png'):
+        options.update(dpi=DIAGRAM_DPI, pil_kwargs=PNG_SAVE_OPTIONS)
+    fig.savefig(output_path, **options)
+    with open(output_path + '.hash', 'w') as hash_file:
+        hash_file.write(SOURCE_HASH)
+
+def create_high_level_architecture(output_path):
     """Generate high-level architecture diagram"""
-    fig, ax = plt.subplots(figsize=(16, 12))
+    # Figures are built directly rather than through pyplot, so no figure manager is registered
+    fig = Figure(figsize=(16, 12))
+    ax = fig.subplots()
     ax.set_xlim(0, 100)
     ax.set_ylim(0, 100)
     ax.axis('off')
@@ -36,33 +93,36 @@ def create_high_level_architecture():
     ax.text(50, 92, 'High-Level Architecture', 
             ha='center', va='top', fontsize=16, color=colors['text'])
     
+    # Container boxes are drawn as one collection; list order keeps the nesting
+    container_boxes = []
+    
     # Snowflake Account Container
     snowflake_box = FancyBboxPatch((2, 5), 96, 82, 
-                                   boxstyle="round,pad=0.5", 
+                                   boxstyle=ACCOUNT_BOXSTYLE, 
                                    edgecolor=colors['snowflake'], 
                                    facecolor='white', 
                                    linewidth=3, alpha=0.9)
-    ax.add_patch(snowflake_box)
+    container_boxes.append(snowflake_box)
     ax.text(5, 84, 'SNOWFLAKE ACCOUNT', fontsize=14, fontweight='bold', 
             color=colors['snowflake'])
     
     # Database Container
     db_box = FancyBboxPatch((5, 8), 90, 72, 
-                            boxstyle="round,pad=0.3", 
+                            boxstyle=LAYER_BOXSTYLE, 
                             edgecolor=colors['border'], 
                             facecolor=colors['background'], 
                             linewidth=2, alpha=0.8)
-    ax.add_patch(db_box)
+    container_boxes.append(db_box)
     ax.text(50, 77, 'DATABASE: DB_INGEST_PIPELINE', 
             ha='center', fontsize=12, fontweight='bold', color=colors['text'])
     
     # Bronze Layer
     bronze_box = FancyBboxPatch((8, 45), 38, 28, 
-                                boxstyle="round,pad=0.3", 
+                                boxstyle=LAYER_BOXSTYLE, 
                                 edgecolor=colors['bronze'], 
                                 facecolor='white', 
                                 linewidth=2.5, alpha=0.95)
-    ax.add_patch(bronze_box)
+    container_boxes.append(bronze_box)
     ax.text(27, 71, 'BRONZE LAYER', ha='center', fontsize=11, 
             fontweight='bold', color=colors['bronze'])
     ax.text(27, 68, 'Raw Data Ingestion', ha='center', fontsize=9, 
@@ -75,18 +135,15 @@ def create_high_level_architecture():
         'Tasks: 5 (discover → process → move)',
         'Procedures: 4+ (file processing)'
     ]
-    y_pos = 63
-    for item in bronze_items:
-        ax.text(10, y_pos, f'• {item}', fontsize=8, color=colors['text'])
-        y_pos -= 4
+    draw_bullet_list(ax, 10, 63, bronze_items)
     
     # Silver Layer
     silver_box = FancyBboxPatch((54, 45), 38, 28, 
-                                boxstyle="round,pad=0.3", 
+                                boxstyle=LAYER_BOXSTYLE, 
                                 edgecolor=colors['silver'], 
                                 facecolor='white', 
                                 linewidth=2.5, alpha=0.95)
-    ax.add_patch(silver_box)
+    container_boxes.append(silver_box)
     ax.text(73, 71, 'SILVER LAYER', ha='center', fontsize=11, 
             fontweight='bold', color=colors['silver'])
     ax.text(73, 68, 'Data Transformation', ha='center', fontsize=9, 
@@ -99,36 +156,33 @@ def create_high_level_architecture():
         'Tasks: 6 (transform → validate)',
         'Procedures: 34+ (ML/LLM mapping)'
     ]
-    y_pos = 63
-    for item in silver_items:
-        ax.text(56, y_pos, f'• {item}', fontsize=8, color=colors['text'])
-        y_pos -= 4
+    draw_bullet_list(ax, 56, 63, silver_items)
     
     # Arrow from Bronze to Silver
     arrow = FancyArrowPatch((46, 59), (54, 59),
                            arrowstyle='->', mutation_scale=30, 
-                           linewidth=3, color=colors['snowflake'])
+                           linewidth=3, color=colors['snowflake'], zorder=2)
     ax.add_patch(arrow)
     ax.text(50, 60.5, 'Transform', ha='center', fontsize=9, 
             fontweight='bold', color=colors['snowflake'])
     
     # Public Schema / Streamlit
     streamlit_box = FancyBboxPatch((8, 12), 84, 28, 
-                                   boxstyle="round,pad=0.3", 
+                                   boxstyle=LAYER_BOXSTYLE, 
                                    edgecolor='#FF4B4B', 
                                    facecolor='white', 
                                    linewidth=2, alpha=0.95)
-    ax.add_patch(streamlit_box)
+    container_boxes.append(streamlit_box)
     ax.text(50, 38, 'PUBLIC SCHEMA - Streamlit Applications', 
             ha='center', fontsize=11, fontweight='bold', color='#FF4B4B')
     
     # Streamlit Apps
     app1_box = FancyBboxPatch((12, 18), 35, 16, 
-                              boxstyle="round,pad=0.2", 
+                              boxstyle=APP_BOXSTYLE, 
                               edgecolor=colors['bronze'], 
                               facecolor='#FFF8DC', 
                               linewidth=1.5)
-    ax.add_patch(app1_box)
+    container_boxes.append(app1_box)
     ax.text(29.5, 31, 'Bronze Ingestion Pipeline', ha='center', 
             fontsize=10, fontweight='bold', color=colors['bronze'])
     ax.text(29.5, 28, '📤 File Upload', ha='center', fontsize=8)
@@ -137,17 +191,18 @@ def create_high_level_architecture():
     ax.text(29.5, 20.5, '📈 Monitoring', ha='center', fontsize=8)
     
     app2_box = FancyBboxPatch((53, 18), 35, 16, 
-                              boxstyle="round,pad=0.2", 
+                              boxstyle=APP_BOXSTYLE, 
                               edgecolor=colors['silver'], 
                               facecolor='#F0F8FF', 
                               linewidth=1.5)
-    ax.add_patch(app2_box)
+    container_boxes.append(app2_box)
     ax.text(70.5, 31, 'Silver Transformation Manager', ha='center', 
             fontsize=10, fontweight='bold', color=colors['silver'])
     ax.text(70.5, 28, '🗺️ Field Mapping', ha='center', fontsize=8)
     ax.text(70.5, 25.5, '📋 Rules Engine', ha='center', fontsize=8)
     ax.text(70.5, 23, '✅ Quality Validation', ha='center', fontsize=8)
     ax.text(70.5, 20.5, '📊 Data Viewer', ha='center', fontsize=8)
+    ax.add_collection(PatchCollection(container_boxes, match_original=True))
     
     # RBAC Section (bottom)
     ax.text(50, 3.5, 'Role-Based Access Control (RBAC)', 
@@ -164,92 +219,58 @@ def create_high_level_architecture():
     ax.text(70, role_y, 'READONLY', ha='center', fontsize=9, 
             bbox=dict(boxstyle='round', facecolor=colors['readonly'], alpha=0.7))
     
-    plt.tight_layout()
-    plt.savefig('docs/design/images/architecture_overview.png', dpi=300, bbox_inches='tight', 
-                facecolor='white', edgecolor='none')
-    print("✓ Generated: images/architecture_overview.png")
-    plt.close()
+    save_diagram(fig, output_path)
+    print(f"✓ Generated: {output_path}")
 
-def create_data_flow_diagram():
-    """Generate data flow diagram"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 10))
-    
-    # Bronze Layer Flow
-    ax1.set_xlim(0, 10)
-    ax1.set_ylim(0, 12)
-    ax1.axis('off')
-    ax1.set_title('Bronze Layer Data Flow', fontsize=16, fontweight='bold', 
-                  color=colors['bronze'], pad=20)
-    
-    steps_bronze = [
-        ('File Upload', 11, '#90EE90'),
-        ('discover_files_task\n(Every 60 min)', 9.5, colors['bronze']),
-        ('process_files_task\n(After discovery)', 8, colors['bronze']),
-        ('move_successful_files\n(SUCCESS → COMPLETED)', 6.5, '#4CAF50'),
-        ('move_failed_files\n(FAILED → ERROR)', 5, '#FF5252'),
-        ('archive_old_files\n(Daily cleanup)', 3.5, '#9E9E9E')
-    ]
+def draw_step_flow(ax, title, title_color, steps):
+    """Draw a vertical chain of (label, y, color, icon) steps joined by arrows"""
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 12)
+    ax.axis('off')
+    ax.set_title(title, fontsize=16, fontweight='bold', color=title_color, pad=20)
     
-    for i, (label, y, color) in enumerate(steps_bronze):
-        box = FancyBboxPatch((1, y-0.4), 8, 0.8, 
-                            boxstyle="round,pad=0.1", 
-                            edgecolor='black', 
-                            facecolor=color, 
-                            linewidth=1.5, alpha=0.8)
-        ax1.add_patch(box)
-        ax1.text(5, y, label, ha='center', va='center', fontsize=9, 
-                fontweight='bold')
-        
-        # Add arrows
-        if i < len(steps_bronze) - 1:
-            arrow = FancyArrowPatch((5, y-0.5), (5, steps_bronze[i+1][1]+0.4),
-                                   arrowstyle='->', mutation_scale=20, 
-                                   linewidth=2, color='black')
-            ax1.add_patch(arrow)
-    
-    # Add stage indicators
-    ax1.text(9.5, 11, '📁', fontsize=20)
-    ax1.text(9.5, 9.5, '🔍', fontsize=20)
-    ax1.text(9.5, 8, '⚙️', fontsize=20)
-    ax1.text(9.5, 6.5, '✅', fontsize=20)
-    ax1.text(9.5, 5, '❌', fontsize=20)
-    ax1.text(9.5, 3.5, '📦', fontsize=20)
-    
-    # Silver Layer Flow
-    ax2.set_xlim(0, 10)
-    ax2.set_ylim(0, 12)
-    ax2.axis('off')
-    ax2.set_title('Silver Layer Data Flow', fontsize=16, fontweight='bold', 
-                  color=colors['silver'], pad=20)
-    
-    steps_silver = [
-        ('Bronze Data Available', 11, '#90EE90'),
-        ('bronze_completion_sensor\n(Every 5 min)', 9.5, colors['silver']),
-        ('silver_discovery_task\n(Identify batches)', 8, colors['silver']),
-        ('silver_transformation_task\n(Apply mappings & rules)', 6.5, colors['silver']),
-        ('silver_quality_check_task\n(Validate data)', 5, '#FFA726'),
+    # Step boxes are drawn as one collection
+    step_boxes = [
+        FancyBboxPatch((1, y-0.4), 8, 0.8, boxstyle=STEP_BOXSTYLE, edgecolor='black',
+                       facecolor=color, linewidth=1.5, alpha=0.8)
+        for _, y, color, _ in steps
     ]
+    ax.add_collection(PatchCollection(step_boxes, match_original=True))
     
-    for i, (label, y, color) in enumerate(steps_silver):
-        box = FancyBboxPatch((1, y-0.4), 8, 0.8, 
-                            boxstyle="round,pad=0.1", 
-                            edgecolor='black', 
-                            facecolor=color, 
-                            linewidth=1.5, alpha=0.8)
-        ax2.add_patch(box)
-        ax2.text(5, y, label, ha='center', va='center', fontsize=9, 
-                fontweight='bold')
-        
-        # Add arrows
-        if i < len(steps_silver) - 1:
-            arrow = FancyArrowPatch((5, y-0.5), (5, steps_silver[i+1][1]+0.4),
-                                   arrowstyle='->', mutation_scale=20, 
-                                   linewidth=2, color='black')
-            ax2.add_patch(arrow)
+    for label, y, _, icon in steps:
+        ax.text(5, y, label, ha='center', va='center', fontsize=9, fontweight='bold')
+        ax.text(9.5, y, icon, fontsize=20)
+    
+    # Arrows between consecutive steps
+    for (_, y, _, _), (_, next_y, _, _) in zip(steps, steps[1:]):
+        ax.add_patch(FancyArrowPatch((5, y-0.5), (5, next_y+0.4), **FLOW_ARROW_STYLE))
+
+def create_data_flow_diagram(output_path):
+    """Generate data flow diagram"""
+    fig = Figure(figsize=(18, 10))
+    ax1, ax2 = fig.subplots(1, 2)
+    
+    # Each panel is a vertical chain of (label, y, colour, icon) steps
+    draw_step_flow(ax1, 'Bronze Layer Data Flow', colors['bronze'], [
+        ('File Upload', 11, '#90EE90', '📁'),
+        ('discover_files_task\n(Every 60 min)', 9.5, colors['bronze'], '🔍'),
+        ('process_files_task\n(After discovery)', 8, colors['bronze'], '⚙️'),
+        ('move_successful_files\n(SUCCESS → COMPLETED)', 6.5, '#4CAF50', '✅'),
+        ('move_failed_files\n(FAILED → ERROR)', 5, '#FF5252', '❌'),
+        ('archive_old_files\n(Daily cleanup)', 3.5, '#9E9E9E', '📦')
+    ])
+    
+    draw_step_flow(ax2, 'Silver Layer Data Flow', colors['silver'], [
+        ('Bronze Data Available', 11, '#90EE90', '📊'),
+        ('bronze_completion_sensor\n(Every 5 min)', 9.5, colors['silver'], '👁️'),
+        ('silver_discovery_task\n(Identify batches)', 8, colors['silver'], '🔍'),
+        ('silver_transformation_task\n(Apply mappings & rules)', 6.5, colors['silver'], '🔄'),
+        ('silver_quality_check_task\n(Validate data)', 5, '#FFA726', '✓'),
+    ])
     
     # Final split
     publish_box = FancyBboxPatch((0.5, 2.5), 4, 0.8, 
-                                boxstyle="round,pad=0.1", 
+                                boxstyle=STEP_BOXSTYLE, 
                                 edgecolor='black', 
                                 facecolor='#4CAF50', 
                                 linewidth=1.5, alpha=0.8)
@@ -258,7 +279,7 @@ def create_data_flow_diagram():
             ha='center', va='center', fontsize=8, fontweight='bold')
     
     quarantine_box = FancyBboxPatch((5.5, 2.5), 4, 0.8, 
-                                   boxstyle="round,pad=0.1", 
+                                   boxstyle=STEP_BOXSTYLE, 
                                    edgecolor='black', 
                                    facecolor='#FF5252', 
                                    linewidth=1.5, alpha=0.8)
@@ -277,22 +298,13 @@ def create_data_flow_diagram():
                             linewidth=2, color='#FF5252')
     ax2.add_patch(arrow2)
     
-    # Add icons
-    ax2.text(9.5, 11, '📊', fontsize=20)
-    ax2.text(9.5, 9.5, '👁️', fontsize=20)
-    ax2.text(9.5, 8, '🔍', fontsize=20)
-    ax2.text(9.5, 6.5, '🔄', fontsize=20)
-    ax2.text(9.5, 5, '✓', fontsize=20)
-    
-    plt.tight_layout()
-    plt.savefig('docs/design/images/data_flow_diagram.png', dpi=300, bbox_inches='tight', 
-                facecolor='white', edgecolor='none')
-    print("✓ Generated: images/data_flow_diagram.png")
-    plt.close()
+    save_diagram(fig, output_path)
+    print(f"✓ Generated: {output_path}")
 
-def create_security_diagram():
+def create_security_diagram(output_path):
     """Generate security and RBAC diagram"""
-    fig, ax = plt.subplots(figsize=(14, 10))
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
@@ -304,66 +316,52 @@ def create_security_diagram():
     ax.text(5, 8.5, 'Role Hierarchy', ha='center', fontsize=13, 
             fontweight='bold', color=colors['text'])
     
+    # Role boxes are drawn as one collection
+    role_boxes = []
+    
     # SYSADMIN (deployment)
     sysadmin_box = FancyBboxPatch((3.5, 7.2), 3, 0.6, 
-                                  boxstyle="round,pad=0.1", 
+                                  boxstyle=STEP_BOXSTYLE, 
                                   edgecolor='black', 
                                   facecolor='#E3F2FD', 
                                   linewidth=2)
-    ax.add_patch(sysadmin_box)
+    role_boxes.append(sysadmin_box)
     ax.text(5, 7.5, 'SYSADMIN\n(Deployment)', ha='center', va='center', 
             fontsize=10, fontweight='bold')
     
     # Arrow down
-    arrow1 = FancyArrowPatch((5, 7.1), (5, 6.5),
-                            arrowstyle='->', mutation_scale=25, 
-                            linewidth=2.5, color='black')
+    arrow1 = FancyArrowPatch((5, 7.1), (5, 6.5), **ROLE_ARROW_STYLE)
     ax.add_patch(arrow1)
     ax.text(5.5, 6.8, 'grants', fontsize=8, style='italic')
     
     # ADMIN Role
-    admin_box = FancyBboxPatch((3, 5.7), 4, 0.7, 
-                               boxstyle="round,pad=0.1", 
-                               edgecolor='black', 
-                               facecolor=colors['admin'], 
-                               linewidth=2.5, alpha=0.8)
-    ax.add_patch(admin_box)
+    admin_box = FancyBboxPatch((3, 5.7), 4, 0.7, facecolor=colors['admin'], **ROLE_BOX_STYLE)
+    role_boxes.append(admin_box)
     ax.text(5, 6.05, 'DB_INGEST_PIPELINE_ADMIN\n(Full Access)', 
             ha='center', va='center', fontsize=10, fontweight='bold', color='white')
     
     # Arrow down
-    arrow2 = FancyArrowPatch((5, 5.6), (5, 5.0),
-                            arrowstyle='->', mutation_scale=25, 
-                            linewidth=2.5, color='black')
+    arrow2 = FancyArrowPatch((5, 5.6), (5, 5.0), **ROLE_ARROW_STYLE)
     ax.add_patch(arrow2)
     ax.text(5.5, 5.3, 'inherits', fontsize=8, style='italic')
     
     # READWRITE Role
-    readwrite_box = FancyBboxPatch((3, 4.2), 4, 0.7, 
-                                   boxstyle="round,pad=0.1", 
-                                   edgecolor='black', 
-                                   facecolor=colors['readwrite'], 
-                                   linewidth=2.5, alpha=0.8)
-    ax.add_patch(readwrite_box)
+    readwrite_box = FancyBboxPatch((3, 4.2), 4, 0.7, facecolor=colors['readwrite'], **ROLE_BOX_STYLE)
+    role_boxes.append(readwrite_box)
     ax.text(5, 4.55, 'DB_INGEST_PIPELINE_READWRITE\n(Read/Write Access)', 
             ha='center', va='center', fontsize=10, fontweight='bold')
     
     # Arrow down
-    arrow3 = FancyArrowPatch((5, 4.1), (5, 3.5),
-                            arrowstyle='->', mutation_scale=25, 
-                            linewidth=2.5, color='black')
+    arrow3 = FancyArrowPatch((5, 4.1), (5, 3.5), **ROLE_ARROW_STYLE)
     ax.add_patch(arrow3)
     ax.text(5.5, 3.8, 'inherits', fontsize=8, style='italic')
     
     # READONLY Role
-    readonly_box = FancyBboxPatch((3, 2.7), 4, 0.7, 
-                                  boxstyle="round,pad=0.1", 
-                                  edgecolor='black', 
-                                  facecolor=colors['readonly'], 
-                                  linewidth=2.5, alpha=0.8)
-    ax.add_patch(readonly_box)
+    readonly_box = FancyBboxPatch((3, 2.7), 4, 0.7, facecolor=colors['readonly'], **ROLE_BOX_STYLE)
+    role_boxes.append(readonly_box)
     ax.text(5, 3.05, 'DB_INGEST_PIPELINE_READONLY\n(Read-Only Access)', 
             ha='center', va='center', fontsize=10, fontweight='bold')
+    ax.add_collection(PatchCollection(role_boxes, match_original=True))
     
     # Permissions Matrix
     ax.text(5, 2, 'Permissions Matrix', ha='center', fontsize=12, 
@@ -399,15 +397,13 @@ def create_security_diagram():
                     ha='center', fontsize=8,
                     bbox=dict(boxstyle='round', facecolor=color, alpha=0.6))
     
-    plt.tight_layout()
-    plt.savefig('docs/design/images/security_rbac_diagram.png', dpi=300, bbox_inches='tight', 
-                facecolor='white', edgecolor='none')
-    print("✓ Generated: images/security_rbac_diagram.png")
-    plt.close()
+    save_diagram(fig, output_path)
+    print(f"✓ Generated: {output_path}")
 
-def create_deployment_pipeline_diagram():
+def create_deployment_pipeline_diagram(output_path):
     """Generate CI/CD deployment pipeline diagram"""
-    fig, ax = plt.subplots(figsize=(16, 8))
+    fig = Figure(figsize=(16, 8))
+    ax = fig.subplots()
     ax.set_xlim(0, 11)
     ax.set_ylim(0, 6)
     ax.axis('off')
@@ -428,14 +424,15 @@ def create_deployment_pipeline_diagram():
         ('Verify', 9.5, '#4CAF50', '✅'),
     ]
     
+    # Stage boxes are drawn as one collection
+    stage_boxes = []
     for i, (label, x, color, icon) in enumerate(stages):
         # Box
-        box = FancyBboxPatch((x-0.35, 2), 0.7, 1.5, 
-                            boxstyle="round,pad=0.1", 
-                            edgecolor='black', 
-                            facecolor=color, 
-                            linewidth=2, alpha=0.7)
-        ax.add_patch(box)
+        stage_boxes.append(FancyBboxPatch((x-0.35, 2), 0.7, 1.5, 
+                                          boxstyle=STEP_BOXSTYLE, 
+                                          edgecolor='black', 
+                                          facecolor=color, 
+                                          linewidth=2, alpha=0.7))
         
         # Icon
         ax.text(x, 3.2, icon, ha='center', va='center', fontsize=20)
@@ -446,10 +443,9 @@ def create_deployment_pipeline_diagram():
         
         # Arrow to next stage
         if i < len(stages) - 1:
-            arrow = FancyArrowPatch((x+0.35, 2.75), (stages[i+1][1]-0.35, 2.75),
-                                   arrowstyle='->', mutation_scale=20, 
-                                   linewidth=2, color='black')
+            arrow = FancyArrowPatch((x+0.35, 2.75), (stages[i+1][1]-0.35, 2.75), **FLOW_ARROW_STYLE)
             ax.add_patch(arrow)
+    ax.add_collection(PatchCollection(stage_boxes, match_original=True))
     
     # Environment labels
     ax.text(3.5, 1.2, 'Development', ha='center', fontsize=10, 
@@ -468,29 +464,48 @@ def create_deployment_pipeline_diagram():
     ax.text(7, legend_y, '■ Testing', fontsize=8, color='#9C27B0')
     ax.text(8.5, legend_y, '■ Approval', fontsize=8, color='#F44336')
     
-    plt.tight_layout()
-    plt.savefig('docs/design/images/deployment_pipeline_diagram.png', dpi=300, bbox_inches='tight', 
-                facecolor='white', edgecolor='none')
-    print("✓ Generated: images/deployment_pipeline_diagram.png")
-    plt.close()
+    save_diagram(fig, output_path)
+    print(f"✓ Generated: {output_path}")
+
+# Output file name (without extension) and generator for each diagram
+DIAGRAMS = [
+    ('architecture_overview', create_high_level_architecture),
+    ('data_flow_diagram', create_data_flow_diagram),
+    ('security_rbac_diagram', create_security_diagram),
+    ('deployment_pipeline_diagram', create_deployment_pipeline_diagram)
+]
 
 def main():
     """Generate all design diagrams"""
+    # Diagrams already rendered by this version of the script are skipped unless --force is given;
+    # --svg writes vector diagrams instead of the PNGs embedded in the docs
+    force = '--force' in sys.argv[1:]
+    image_format = 'svg' if '--svg' in sys.argv[1:] else 'png'
+    
     print("Generating design diagrams...")
     print("-" * 50)
     
-    create_high_level_architecture()
-    create_data_flow_diagram()
-    create_security_diagram()
-    create_deployment_pipeline_diagram()
+    # Check outputs up front so a warm run never starts a worker process
+    pending = []
+    for name, create_diagram in DIAGRAMS:
+        output_path = f'docs/design/images/{name}.{image_format}'
+        if not force and is_up_to_date(output_path):
+            print(f"· Up to date: {output_path}")
+        else:
+            pending.append((create_diagram, output_path))
+    
+    # The diagrams are independent CPU-bound renders; separate processes keep matplotlib's global state apart
+    if pending:
+        with ProcessPoolExecutor(max_workers=len(pending)) as executor:
+            futures = [executor.submit(create_diagram, output_path) for create_diagram, output_path in pending]
+            for future in futures:
+                future.result()
     
     print("-" * 50)
     print("✓ All diagrams generated successfully!")
     print("\nGenerated files:")
-    print("  - docs/design/architecture_overview.png")
-    print("  - docs/design/data_flow_diagram.png")
-    print("  - docs/design/security_rbac_diagram.png")
-    print("  - docs/design/deployment_pipeline_diagram.png")
+    for name, _ in DIAGRAMS:
+        print(f"  - docs/design/images/{name}.{image_format}")
     print("\nThese diagrams can be embedded in SYSTEM_DESIGN.md")
 
 if __name__ == "__main__":
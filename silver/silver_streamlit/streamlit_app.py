@@ -4,9 +4,11 @@ Silver Layer Data Management Application
 Streamlit in Snowflake application for managing Silver layer transformations.
 """
 
+import re
 import streamlit as st
 import pandas as pd
 from snowflake.snowpark.context import get_active_session
+from snowflake.snowpark.exceptions import SnowparkSQLException
 
 # Get Snowpark session
 session = get_active_session()
@@ -18,8 +20,10 @@ session = get_active_session()
 APP_TITLE = "Silver Transformation Manager"
 APP_ICON = "🥈"
 
-# Custom CSS for dark header and styling
-st.markdown("""
+# App-wide CSS: dark header and sidebar styling plus the shared message-box classes,
+# kept in one constant so each rerun emits a single <style> block. st.html sends style-only
+# content to the page head instead of rendering a markdown element
+APP_CSS = """
     <style>
     /* Hide default Streamlit header */
     #MainMenu {visibility: hidden;}
@@ -35,21 +39,99 @@ st.markdown("""
     .stSelectbox {
         margin-top: 0 !important;
     }
+    
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E88E5;
+        font-weight: bold;
+        margin-bottom: 1rem;
+    }
+    .success-box {
+        padding: 1rem;
+        border-radius: 0.5rem;
+        background-color: #D4EDDA;
+        border: 1px solid #C3E6CB;
+        color: #155724;
+        margin: 1rem 0;
+    }
+    .error-box {
+        padding: 1rem;
+        border-radius: 0.5rem;
+        background-color: #F8D7DA;
+        border: 1px solid #F5C6CB;
+        color: #721C24;
+        margin: 1rem 0;
+    }
+    .info-box {
+        padding: 1rem;
+        border-radius: 0.5rem;
+        background-color: #D1ECF1;
+        border: 1px solid #BEE5EB;
+        color: #0C5460;
+        margin: 1rem 0;
+    }
     </style>
-""", unsafe_allow_html=True)
+"""
 
-# Get list of TPAs
-@st.cache_data(ttl=300)
+# Compact layout for the Target Table Designer, emitted by that page only
+DESIGNER_CSS = """
+    <style>
+    /* Reduce spacing in forms and columns */
+    .stForm {
+        padding: 0.5rem 0 !important;
+    }
+    div[data-testid="column"] {
+        padding: 0.25rem !important;
+    }
+    /* Reduce input field heights */
+    .stTextInput input, .stSelectbox select {
+        font-size: 0.875rem !important;
+        padding: 0.25rem 0.5rem !important;
+        min-height: 2rem !important;
+    }
+    /* Reduce checkbox size */
+    .stCheckbox {
+        font-size: 0.875rem !important;
+    }
+    /* Reduce button padding */
+    .stButton button {
+        padding: 0.25rem 0.5rem !important;
+        font-size: 0.875rem !important;
+        min-height: 2rem !important;
+    }
+    /* Reduce text size in columns */
+    div[data-testid="column"] p {
+        font-size: 0.875rem !important;
+        margin-bottom: 0.25rem !important;
+    }
+    /* Reduce header sizes */
+    h4 {
+        font-size: 1.1rem !important;
+        margin-top: 0.5rem !important;
+        margin-bottom: 0.5rem !important;
+    }
+    /* Reduce markdown spacing */
+    .element-container {
+        margin-bottom: 0.25rem !important;
+    }
+    </style>
+"""
+st.html(APP_CSS)
+
+# Constant query text, so every session sends byte-identical SQL and can reuse Snowflake's result cache
+TPA_LIST_SQL = """
+    SELECT TPA_CODE, TPA_NAME, TPA_DESCRIPTION
+    FROM BRONZE.TPA_MASTER
+    WHERE ACTIVE = TRUE
+    ORDER BY TPA_CODE
+"""
+
+# Get list of TPAs (rarely changes, so one copy is shared across all sessions)
+@st.cache_resource(ttl=3600)
 def get_tpa_list(_session):
     """Get list of active TPAs from TPA_MASTER table"""
     try:
-        query = """
-            SELECT TPA_CODE, TPA_NAME, TPA_DESCRIPTION
-            FROM BRONZE.TPA_MASTER
-            WHERE ACTIVE = TRUE
-            ORDER BY TPA_CODE
-        """
-        result = _session.sql(query).collect()
+        result = _session.sql(TPA_LIST_SQL).collect()
         return [(row['TPA_CODE'], row['TPA_NAME']) for row in result]
     except Exception as e:
         st.error(f"Error loading TPAs: {e}")
@@ -111,8 +193,19 @@ st.sidebar.markdown("---")
 # CONFIGURATION
 # ============================================
 
-# Load configuration from Snowflake stage
-@st.cache_data(ttl=300)
+# Reads a staged config file as a single record. Stage paths can't be bind variables,
+# so only the location is substituted into this fixed text
+CONFIG_FILE_SQL = """
+    SELECT $1 AS line
+    FROM {config_path}
+    (FILE_FORMAT => (TYPE=CSV FIELD_DELIMITER=NONE RECORD_DELIMITER=NONE))
+"""
+
+# KEY=value lines of a config file, with optional quotes around the value
+CONFIG_LINE_PATTERN = re.compile(r'^[ \t]*([A-Za-z_]\w*)[ \t]*=[ \t]*["\']?(.*?)["\']?[ \t]*\r?$', re.MULTILINE)
+
+# Load configuration from Snowflake stage (shared across all sessions - treat the dict as read-only)
+@st.cache_resource(ttl=3600)
 def load_config_from_stage(_session):
     """Load configuration from config file stored in Snowflake stage"""
     config = {
@@ -129,39 +222,34 @@ def load_config_from_stage(_session):
         'SILVER_STREAMLIT_APP_NAME': 'SILVER_DATA_MANAGER'
     }
     
+    config_stage = f"@{config['DATABASE_NAME']}.PUBLIC.CONFIG_STAGE"
     try:
-        # Try to load from CONFIG_STAGE (uploaded during deployment)
-        # First try custom.config, then fall back to default.config
-        config_files = ['custom.config', 'default.config']
-        
-        for config_file in config_files:
-            try:
-                # Check if file exists in PUBLIC.CONFIG_STAGE
-                result = _session.sql(f"""
-                    SELECT $1 as line
-                    FROM @{config['DATABASE_NAME']}.PUBLIC.CONFIG_STAGE/{config_file}
-                    (FILE_FORMAT => (TYPE=CSV FIELD_DELIMITER=NONE RECORD_DELIMITER=NONE))
-                """).collect()
-                
-                if result:
-                    # Parse config file
-                    for row in result:
-                        line = row['LINE'].strip()
-                        # Skip comments and empty lines
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-                            config[key] = value
-                    
-                    # Store config source for later display
-                    config['_config_source'] = config_file
-                    break
-            except:
-                continue
-                
-    except Exception as e:
-        # If loading from stage fails, use defaults
+        # Try to load from CONFIG_STAGE (uploaded during deployment).
+        # List the stage once and read only the file that exists - custom.config wins over default.config
+        staged_files = {
+            row['name'].rsplit('/', 1)[-1]
+            for row in _session.sql(f"LIST {config_stage}").collect()
+        }
+        config_file = next(
+            (name for name in ['custom.config', 'default.config'] if name in staged_files),
+            None
+        )
+        
+        if config_file:
+            result = _session.sql(
+                CONFIG_FILE_SQL.format(config_path=f"{config_stage}/{config_file}")
+            ).collect()
+            
+            # The whole file arrives as one record; one regex pass picks out the KEY=value lines
+            # (comments and blank lines never match)
+            for row in result:
+                for key, value in CONFIG_LINE_PATTERN.findall(row['LINE'] or ''):
+                    config[key] = value
+            
+            # Store config source for later display
+            config['_config_source'] = config_file
+    except SnowparkSQLException:
+        # Stage missing or unreadable - use defaults
         config['_config_source'] = 'default'
     
     return config
@@ -197,7 +285,7 @@ DEFAULT_LLM_MODEL = config.get('DEFAULT_LLM_MODEL', 'SNOWFLAKE-ARCTIC')
 DEFAULT_BATCH_SIZE = int(config.get('DEFAULT_BATCH_SIZE', '10000'))
 SILVER_TRANSFORM_SCHEDULE_MINUTES = config.get('SILVER_TRANSFORM_SCHEDULE_MINUTES', '15')
 
-DATA_TYPES = [
+DATA_TYPES = (
     "VARCHAR(20)", "VARCHAR(50)", "VARCHAR(100)", "VARCHAR(200)", 
     "VARCHAR(500)", "VARCHAR(1000)", "VARCHAR(5000)",
     "NUMBER(10,0)", "NUMBER(15,2)", "NUMBER(18,2)", "NUMBER(38,0)", 
@@ -205,9 +293,18 @@ DATA_TYPES = [
     "BOOLEAN", "DATE", 
     "TIMESTAMP_NTZ", "TIMESTAMP_LTZ", "TIMESTAMP_TZ",
     "VARIANT", "OBJECT", "ARRAY"
-]
+)
+
+# Metadata columns added to every new target table:
+# (column_name, data_type, nullable, default_value, description)
+STANDARD_COLUMNS = (
+    ("SOURCE_FILE_NAME", "VARCHAR(500)", True, None, "Original source file name from Bronze layer"),
+    ("INGESTION_TIMESTAMP", "TIMESTAMP_NTZ", False, "CURRENT_TIMESTAMP()", "Timestamp when record was ingested"),
+    ("CREATED_AT", "TIMESTAMP_NTZ", False, "CURRENT_TIMESTAMP()", "Record creation timestamp in Silver layer"),
+    ("UPDATED_AT", "TIMESTAMP_NTZ", False, "CURRENT_TIMESTAMP()", "Record last update timestamp")
+)
 
-DEFAULT_VALUES = [
+DEFAULT_VALUES = (
     "(None)",
     "CURRENT_TIMESTAMP()",
     "CURRENT_DATE()",
@@ -218,7 +315,19 @@ DEFAULT_VALUES = [
     "FALSE",
     "''",
     "NULL"
-]
+)
+
+# Target Table Designer column grid config, built once at import time and shared by every render
+TARGET_COLUMNS_COLUMN_CONFIG = {
+    "ID": st.column_config.NumberColumn("ID", disabled=True, width="small"),
+    "Column Name": st.column_config.TextColumn("Column Name", required=True, width="medium"),
+    "Data Type": st.column_config.SelectboxColumn("Data Type", options=DATA_TYPES, required=True, width="medium"),
+    "Default": st.column_config.SelectboxColumn("Default", options=DEFAULT_VALUES, width="medium"),
+    "Description": st.column_config.TextColumn("Description", width="large"),
+}
+
+# Most tables listed in the Target Table Designer's selector at once; the search box narrows the rest
+TABLE_LIST_DISPLAY_MAX = 50
 
 RULE_TYPES = ["DATA_QUALITY", "BUSINESS_LOGIC", "STANDARDIZATION", "DEDUPLICATION"]
 ERROR_ACTIONS = ["LOG", "REJECT", "QUARANTINE"]
@@ -227,8 +336,8 @@ ERROR_ACTIONS = ["LOG", "REJECT", "QUARANTINE"]
 # UTILITY FUNCTIONS
 # ============================================
 
-@st.cache_data(ttl=60)
-def check_deployment_status(_session):
+@st.cache_data(ttl=600)
+def check_deployment_status(_session, database_name, schema_name):
     """Check if Silver layer is fully deployed"""
     required_tables = [
         'target_schemas',
@@ -237,13 +346,20 @@ def check_deployment_status(_session):
         'silver_processing_log'
     ]
     
-    missing_objects = []
-    
-    for table in required_tables:
-        try:
-            _session.sql(f"SELECT 1 FROM {DB_SILVER}.{table} LIMIT 1").collect()
-        except:
-            missing_objects.append(table)
+    # One metadata lookup for all required tables instead of a probe query per table
+    table_placeholders = ", ".join(["?"] * len(required_tables))
+    try:
+        result = _session.sql(f"""
+            SELECT TABLE_NAME
+            FROM {database_name}.INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = ?
+              AND TABLE_NAME IN ({table_placeholders})
+        """, params=[schema_name.upper()] + [table.upper() for table in required_tables]).collect()
+        found_tables = {row['TABLE_NAME'].lower() for row in result}
+    except Exception:
+        found_tables = set()
+    
+    missing_objects = [table for table in required_tables if table not in found_tables]
     
     return {
         'is_deployed': len(missing_objects) == 0,
@@ -255,13 +371,16 @@ def get_table_path(table_name, schema=None):
     schema = schema or SILVER_SCHEMA
     return f"{DATABASE_NAME}.{schema}.{table_name}"
 
-def execute_query(query, show_error=True):
-    """Execute a SQL query and return results as DataFrame"""
+@st.cache_data(ttl=600)
+def get_session_context(_session, session_id):
+    """Get current user and role in a single query, cached per Snowflake session"""
+    row = _session.sql("SELECT CURRENT_USER(), CURRENT_ROLE()").collect()[0]
+    return row[0], row[1]
+
+def execute_query(query, show_error=True, params=None):
+    """Execute a SQL query (with optional ? bind values) and return results as DataFrame"""
     try:
-        result = session.sql(query).collect()
-        if result:
-            return pd.DataFrame([row.as_dict() for row in result])
-        return pd.DataFrame()
+        return session.sql(query, params=params).to_pandas()
     except Exception as e:
         if show_error:
             error_msg = str(e)
@@ -272,17 +391,93 @@ def execute_query(query, show_error=True):
         return pd.DataFrame()
 
 
-def execute_procedure(proc_call):
-    """Execute a stored procedure and return result"""
+def execute_procedure(proc_name, *args):
+    """Execute a stored procedure and return its scalar result as a string"""
     try:
-        result = session.sql(proc_call).collect()
-        if result and len(result) > 0:
-            return str(list(result[0].as_dict().values())[0])
+        # session.call renders each argument as a typed SQL literal (quoting and escaping strings)
+        # and returns the scalar result as a plain value. Every silver procedure returns a scalar,
+        # so is_return_table=False skips the DESCRIBE PROCEDURE lookup Snowpark would otherwise run
+        result = session.call(proc_name, *args, is_return_table=False)
+        if result is not None:
+            return str(result)
         return "Procedure executed successfully"
     except Exception as e:
         return f"Error: {str(e)}"
 
 
+# Target table metadata only changes through the designer, which clears these caches after
+# each create, save or delete - the TTL just bounds staleness from edits made elsewhere
+@st.cache_data(ttl=60)
+def load_target_schemas_summary(tpa):
+    """Get the per-table summary of target schemas, optionally filtered by TPA"""
+    tpa_filter = "WHERE tpa = ?" if tpa else ""
+    return execute_query(
+        f"SELECT * FROM {DB_SILVER}.v_target_schemas_summary {tpa_filter} ORDER BY table_name",
+        params=[tpa] if tpa else None
+    )
+
+@st.cache_data(ttl=60)
+def load_target_table_schema(table_name, tpa):
+    """Get the active column definitions of one target table, optionally filtered by TPA"""
+    tpa_filter = "AND tpa = ?" if tpa else ""
+    return execute_query(f"""
+        SELECT schema_id, column_name, data_type, nullable, 
+               default_value, description
+        FROM {DB_SILVER}.target_schemas
+        WHERE table_name = ?
+          AND active = TRUE
+          {tpa_filter}
+        ORDER BY schema_id
+    """, params=[table_name, tpa] if tpa else [table_name])
+
+def clear_target_schema_cache():
+    """Drop cached target table metadata after the designer changes it"""
+    load_target_schemas_summary.clear()
+    load_target_table_schema.clear()
+
+def insert_target_columns(columns):
+    """Insert (table_name, column_name, data_type, nullable, default_value, description, tpa)
+    column definitions with one multi-row INSERT"""
+    placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, TRUE, ?)"] * len(columns))
+    return execute_query(f"""
+        INSERT INTO {DB_SILVER}.target_schemas (
+            table_name, column_name, data_type, nullable,
+            default_value, description, active, tpa
+        )
+        VALUES {placeholders}
+    """, params=[value for column in columns for value in column])
+
+def update_target_columns(columns):
+    """Apply (schema_id, column_name, data_type, default_value, description) edits with one MERGE"""
+    placeholders = ", ".join(["(?, ?, ?, ?, ?)"] * len(columns))
+    return execute_query(f"""
+        MERGE INTO {DB_SILVER}.target_schemas t
+        USING (
+            SELECT column1 AS schema_id, column2 AS column_name, column3 AS data_type,
+                   column4 AS default_value, column5 AS description
+            FROM VALUES {placeholders}
+        ) s
+        ON t.schema_id = s.schema_id
+        WHEN MATCHED THEN UPDATE SET
+            column_name = s.column_name,
+            data_type = s.data_type,
+            nullable = TRUE,
+            default_value = s.default_value,
+            description = s.description,
+            updated_timestamp = CURRENT_TIMESTAMP()
+    """, params=[value for column in columns for value in column])
+
+def deactivate_target_columns(schema_ids):
+    """Soft-delete target schema columns with one UPDATE"""
+    placeholders = ", ".join(["?"] * len(schema_ids))
+    return execute_query(f"""
+        UPDATE {DB_SILVER}.target_schemas
+        SET active = FALSE,
+            updated_timestamp = CURRENT_TIMESTAMP()
+        WHERE schema_id IN ({placeholders})
+    """, params=list(schema_ids))
+
+
 # ============================================
 # APP CONFIGURATION
 # ============================================
@@ -294,42 +489,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        color: #1E88E5;
-        font-weight: bold;
-        margin-bottom: 1rem;
-    }
-    .success-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #D4EDDA;
-        border: 1px solid #C3E6CB;
-        color: #155724;
-        margin: 1rem 0;
-    }
-    .error-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #F8D7DA;
-        border: 1px solid #F5C6CB;
-        color: #721C24;
-        margin: 1rem 0;
-    }
-    .info-box {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: #D1ECF1;
-        border: 1px solid #BEE5EB;
-        color: #0C5460;
-        margin: 1rem 0;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
 # ============================================
 # SIDEBAR - CONFIGURATION
 # ============================================
@@ -366,8 +525,7 @@ with st.sidebar:
     # Show current context
     with st.expander("View Session Info"):
         try:
-            current_user = session.sql("SELECT CURRENT_USER()").collect()[0][0]
-            current_role = session.sql("SELECT CURRENT_ROLE()").collect()[0][0]
+            current_user, current_role = get_session_context(session, session.session_id)
             st.text(f"User: {current_user}")
             st.text(f"Role: {current_role}")
             st.text(f"Database: {DATABASE_NAME}")
@@ -389,8 +547,17 @@ st.markdown("---")
 # DEPLOYMENT STATUS CHECK
 # ============================================
 
-# Check deployment status and show banner if not fully deployed
-deployment_status = check_deployment_status(session)
+def recheck_deployment_status():
+    """Drop the cached deployment check so the next run queries Snowflake again"""
+    check_deployment_status.clear()
+
+# Check deployment status and show banner if not fully deployed. Once a session has seen
+# a complete deployment the check is skipped for the rest of that session
+if st.session_state.get('deployment_ok'):
+    deployment_status = {'is_deployed': True, 'missing_objects': []}
+else:
+    deployment_status = check_deployment_status(session, DATABASE_NAME, SILVER_SCHEMA)
+    st.session_state['deployment_ok'] = deployment_status['is_deployed']
 
 if not deployment_status['is_deployed']:
     st.warning(f"""
@@ -402,67 +569,46 @@ if not deployment_status['is_deployed']:
     **To complete deployment:**
     1. Run the Silver layer deployment script: `./deploy_silver.sh`
     2. Or run the full deployment: `./deploy.sh`
-    3. Refresh this page once deployment is complete
+    3. Click **Re-check deployment** below once deployment is complete
     
     Some features may not work until deployment is complete.
     """)
+    st.button("🔄 Re-check deployment", on_click=recheck_deployment_status)
 
 # ============================================
 # PAGE: TARGET TABLE DESIGNER
 # ============================================
 
-if page == "📐 Target Table Designer":
+@st.dialog("Delete Table")
+def confirm_delete_table(table_name):
+    """Confirm and drop a target table (a dialog, so confirming does not re-render the designer underneath)"""
+    st.warning(f"⚠️ Delete table **{table_name}**?")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("✅ Yes, Delete", key=f"confirm_yes_{table_name}", type="primary", use_container_width=True):
+            result = execute_procedure(f"{DB_SILVER}.drop_silver_table", table_name, True)
+            clear_target_schema_cache()
+            if "Error" in result:
+                st.error(result)
+            else:
+                st.session_state['selected_table'] = None
+                st.rerun()
+    with col2:
+        if st.button("❌ Cancel", key=f"confirm_no_{table_name}", use_container_width=True):
+            st.rerun()
+
+@st.fragment
+def render_target_table_designer():
+    """Target Table Designer page body (a fragment, so selecting and editing tables only reruns this page)"""
     st.markdown("### 📐 Target Table Designer")
     tpa_msg = f" for {st.session_state.selected_tpa_name}" if st.session_state.selected_tpa else ""
     st.markdown(f"Define target tables for the Silver layer{tpa_msg}")
     
-    # Add custom CSS for compact layout
-    st.markdown("""
-        <style>
-        /* Reduce spacing in forms and columns */
-        .stForm {
-            padding: 0.5rem 0 !important;
-        }
-        div[data-testid="column"] {
-            padding: 0.25rem !important;
-        }
-        /* Reduce input field heights */
-        .stTextInput input, .stSelectbox select {
-            font-size: 0.875rem !important;
-            padding: 0.25rem 0.5rem !important;
-            min-height: 2rem !important;
-        }
-        /* Reduce checkbox size */
-        .stCheckbox {
-            font-size: 0.875rem !important;
-        }
-        /* Reduce button padding */
-        .stButton button {
-            padding: 0.25rem 0.5rem !important;
-            font-size: 0.875rem !important;
-            min-height: 2rem !important;
-        }
-        /* Reduce text size in columns */
-        div[data-testid="column"] p {
-            font-size: 0.875rem !important;
-            margin-bottom: 0.25rem !important;
-        }
-        /* Reduce header sizes */
-        h4 {
-            font-size: 1.1rem !important;
-            margin-top: 0.5rem !important;
-            margin-bottom: 0.5rem !important;
-        }
-        /* Reduce markdown spacing */
-        .element-container {
-            margin-bottom: 0.25rem !important;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    # Compact layout for the designer's forms and columns
+    st.html(DESIGNER_CSS)
     
     # Get table summary (filtered by TPA)
-    tpa_filter = f"WHERE tpa = '{st.session_state.selected_tpa}'" if st.session_state.selected_tpa else ""
-    summary_df = execute_query(f"SELECT * FROM {DB_SILVER}.v_target_schemas_summary {tpa_filter} ORDER BY table_name")
+    summary_df = load_target_schemas_summary(st.session_state.selected_tpa)
     
     # Two-column layout: Table selector on left, Details on right
     col_left, col_right = st.columns([1, 3])
@@ -473,7 +619,7 @@ if page == "📐 Target Table Designer":
         # New Table button
         if st.button("➕ New Table", use_container_width=True, type="primary"):
             st.session_state['selected_table'] = '__NEW__'
-            st.rerun()
+            st.rerun(scope="fragment")
         
         st.markdown("---")
         
@@ -489,25 +635,37 @@ if page == "📐 Target Table Designer":
             
             # Only show radio buttons if not creating a new table
             if current_table != '__NEW__':
-                # Get current selection index
-                if current_table in table_list:
-                    current_index = table_list.index(current_table)
-                else:
-                    current_index = 0
-                
-                # Radio button for table selection
-                selected_table_name = st.radio(
-                    "Select a table:",
-                    options=table_list,
-                    index=current_index,
-                    key="table_radio",
+                # Narrow long lists with a search box; the radio renders at most TABLE_LIST_DISPLAY_MAX options
+                table_search = st.text_input(
+                    "Search tables",
+                    key="table_search",
+                    placeholder="🔍 Search tables",
                     label_visibility="collapsed"
                 )
+                visible_tables = [table for table in table_list if table_search.lower() in table.lower()]
+                if len(visible_tables) > TABLE_LIST_DISPLAY_MAX:
+                    st.caption(f"Showing {TABLE_LIST_DISPLAY_MAX} of {len(visible_tables)} tables - refine the search to see more")
+                    visible_tables = visible_tables[:TABLE_LIST_DISPLAY_MAX]
                 
-                # Update session state if selection changed
-                if selected_table_name != st.session_state.get('selected_table'):
-                    st.session_state['selected_table'] = selected_table_name
-                    st.rerun()
+                if not visible_tables:
+                    st.caption("No tables match the search")
+                else:
+                    # Get current selection index (no selection if the current table is filtered out)
+                    current_index = visible_tables.index(current_table) if current_table in visible_tables else None
+                    
+                    # Radio button for table selection
+                    selected_table_name = st.radio(
+                        "Select a table:",
+                        options=visible_tables,
+                        index=current_index,
+                        key="table_radio",
+                        label_visibility="collapsed"
+                    )
+                    
+                    # Update session state if selection changed
+                    if selected_table_name is not None and selected_table_name != st.session_state.get('selected_table'):
+                        st.session_state['selected_table'] = selected_table_name
+                        st.rerun(scope="fragment")
             else:
                 # Show message when creating new table
                 st.info("Creating new table...")
@@ -517,28 +675,6 @@ if page == "📐 Target Table Designer":
     with col_right:
         selected_table = st.session_state.get('selected_table')
         
-        # Handle delete confirmation
-        if not summary_df.empty:
-            for table_name in summary_df["TABLE_NAME"].tolist():
-                if st.session_state.get(f'confirm_delete_{table_name}'):
-                    st.warning(f"⚠️ Delete table **{table_name}**?")
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("✅ Yes, Delete", key=f"confirm_yes_{table_name}", type="primary", use_container_width=True):
-                            result = execute_procedure(f"CALL {DB_SILVER}.drop_silver_table('{table_name}', TRUE)")
-                            if "Error" in result:
-                                st.error(result)
-                            else:
-                                st.success(result)
-                                st.session_state.pop(f'confirm_delete_{table_name}', None)
-                                st.session_state['selected_table'] = None
-                                st.rerun()
-                    with col2:
-                        if st.button("❌ Cancel", key=f"confirm_no_{table_name}", use_container_width=True):
-                            st.session_state.pop(f'confirm_delete_{table_name}', None)
-                            st.rerun()
-                    st.stop()
-        
         # Show create new table form
         if selected_table == '__NEW__':
             st.markdown("### ➕ Create New Table")
@@ -580,62 +716,30 @@ if page == "📐 Target Table Designer":
                         if not st.session_state.selected_tpa:
                             st.error("❌ Please select a TPA from the dropdown at the top of the page before creating tables.")
                         else:
-                            # Insert first column
-                            insert_query = f"""
-                                INSERT INTO {DB_SILVER}.target_schemas (
-                                    table_name, column_name, data_type, nullable,
-                                    default_value, description, active, tpa
-                                )
-                                VALUES (
-                                    '{new_table_name.upper()}',
-                                    '{first_column_name.upper()}',
-                                    '{first_data_type}',
-                                    {first_nullable},
-                                    {f"'{processed_default}'" if processed_default else 'NULL'},
-                                    {f"'{first_description}'" if first_description else 'NULL'},
-                                    TRUE,
-                                    '{st.session_state.selected_tpa}'
-                                )
-                            """
-                        execute_query(insert_query)
-                        
-                        # Automatically add standard metadata columns
-                        standard_columns = [
-                            ("SOURCE_FILE_NAME", "VARCHAR(500)", "TRUE", "NULL", "Original source file name from Bronze layer"),
-                            ("INGESTION_TIMESTAMP", "TIMESTAMP_NTZ", "FALSE", "CURRENT_TIMESTAMP()", "Timestamp when record was ingested"),
-                            ("CREATED_AT", "TIMESTAMP_NTZ", "FALSE", "CURRENT_TIMESTAMP()", "Record creation timestamp in Silver layer"),
-                            ("UPDATED_AT", "TIMESTAMP_NTZ", "FALSE", "CURRENT_TIMESTAMP()", "Record last update timestamp")
-                        ]
-                        
-                        for col_name, data_type, nullable, default_val, description in standard_columns:
-                            std_col_query = f"""
-                                INSERT INTO {DB_SILVER}.target_schemas (
-                                    table_name, column_name, data_type, nullable,
-                                    default_value, description, active, tpa
-                                )
-                                VALUES (
-                                    '{new_table_name.upper()}',
-                                    '{col_name}',
-                                    '{data_type}',
-                                    {nullable},
-                                    {f"'{default_val}'" if default_val != "NULL" else 'NULL'},
-                                    '{description}',
-                                    TRUE,
-                                    '{st.session_state.selected_tpa}'
-                                )
-                            """
-                            execute_query(std_col_query)
-                        
-                        # Automatically create the physical table
-                        with st.spinner(f"Creating {new_table_name.upper()} in database..."):
-                            result = execute_procedure(f"CALL {DB_SILVER}.create_silver_table('{new_table_name.upper()}')")
-                            if "Successfully" in result:
-                                st.success(f"✅ Created table with standard metadata columns! {result}")
-                            else:
-                                st.warning(f"⚠️ Created table definition, but physical table creation had issues: {result}")
-                        
-                        st.session_state['selected_table'] = new_table_name.upper()
-                        st.rerun()
+                            # Insert the first column and the standard metadata columns in one statement
+                            table_name = new_table_name.upper()
+                            tpa = st.session_state.selected_tpa
+                            columns = [(
+                                table_name, first_column_name.upper(), first_data_type, first_nullable,
+                                processed_default, first_description or None, tpa
+                            )]
+                            columns += [
+                                (table_name, col_name, data_type, nullable, default_val, description, tpa)
+                                for col_name, data_type, nullable, default_val, description in STANDARD_COLUMNS
+                            ]
+                            insert_target_columns(columns)
+                            
+                            # Automatically create the physical table
+                            with st.spinner(f"Creating {table_name} in database..."):
+                                result = execute_procedure(f"{DB_SILVER}.create_silver_table", table_name)
+                                clear_target_schema_cache()
+                                if "Successfully" in result:
+                                    st.success(f"✅ Created table with standard metadata columns! {result}")
+                                else:
+                                    st.warning(f"⚠️ Created table definition, but physical table creation had issues: {result}")
+                            
+                            st.session_state['selected_table'] = table_name
+                            st.rerun(scope="fragment")
                     except Exception as e:
                         st.error(f"❌ Error creating table: {str(e)}")
             
@@ -644,21 +748,12 @@ if page == "📐 Target Table Designer":
                     st.session_state['selected_table'] = summary_df["TABLE_NAME"].iloc[0]
                 else:
                     st.session_state.pop('selected_table', None)
-                st.rerun()
+                st.rerun(scope="fragment")
         
         # Show selected table details
         elif selected_table and selected_table != '__NEW__':
             # Filter by TPA
-            tpa_filter = f"AND tpa = '{st.session_state.selected_tpa}'" if st.session_state.selected_tpa else ""
-            schema_df = execute_query(f"""
-                SELECT schema_id, column_name, data_type, nullable, 
-                       default_value, description
-                FROM {DB_SILVER}.target_schemas
-                WHERE table_name = '{selected_table}'
-                  AND active = TRUE
-                  {tpa_filter}
-                ORDER BY schema_id
-            """)
+            schema_df = load_target_table_schema(selected_table, st.session_state.selected_tpa)
             
             # Table name and delete button on same row
             col_title, col_delete = st.columns([4, 1])
@@ -666,8 +761,7 @@ if page == "📐 Target Table Designer":
                 st.markdown(f"### 📋 {selected_table}")
             with col_delete:
                 if st.button("🗑️ Delete", type="secondary", key=f"delete_btn_{selected_table}"):
-                    st.session_state[f'confirm_delete_{selected_table}'] = True
-                    st.rerun()
+                    confirm_delete_table(selected_table)
             
             # Show columns using st.data_editor
             if not schema_df.empty:
@@ -687,129 +781,97 @@ if page == "📐 Target Table Designer":
                     'DESCRIPTION': 'Description'
                 })
                 
-                # Configure column settings - allow row deletion
-                edited_df = st.data_editor(
-                    edit_df,
-                column_config={
-                        "ID": st.column_config.NumberColumn("ID", disabled=True, width="small"),
-                        "Column Name": st.column_config.TextColumn("Column Name", required=True, width="medium"),
-                        "Data Type": st.column_config.SelectboxColumn("Data Type", options=DATA_TYPES, required=True, width="medium"),
-                        "Default": st.column_config.SelectboxColumn("Default", options=DEFAULT_VALUES, width="medium"),
-                        "Description": st.column_config.TextColumn("Description", width="large"),
-                    },
-                    hide_index=True,
-                    num_rows="dynamic",  # Allow adding/deleting rows
-                    use_container_width=True,
-                    key=f"editor_{selected_table}"
-                )
-                
-                st.markdown("**Actions:**")
-                st.info("💡 Double-click to edit. Add rows for new columns. Delete rows to remove columns. Click 'Save Changes' to apply.")
+                # Edits are held in a form so the grid only reruns the page when Save Changes is clicked
+                with st.form(f"edit_table_form_{selected_table}", border=False):
+                    # Configure column settings - allow row deletion
+                    edited_df = st.data_editor(
+                        edit_df,
+                        column_config=TARGET_COLUMNS_COLUMN_CONFIG,
+                        hide_index=True,
+                        num_rows="dynamic",  # Allow adding/deleting rows
+                        use_container_width=True,
+                        key=f"editor_{selected_table}"
+                    )
+                    
+                    st.markdown("**Actions:**")
+                    st.info("💡 Double-click to edit. Add rows for new columns. Delete rows to remove columns. Click 'Save Changes' to apply.")
+                    
+                    # Save button
+                    save_changes = st.form_submit_button("💾 Save Changes", type="primary", use_container_width=True)
                 
-                # Save button
-                if st.button("💾 Save Changes", type="primary", use_container_width=True):
-                    changes_made = False
-                    deletions_made = False
-                    additions_made = False
+                if save_changes:
+                    editable_cols = ['Column Name', 'Data Type', 'Default', 'Description']
                     
-                    # Check for deleted rows (rows in original but not in edited)
-                    original_ids = set(edit_df['ID'].tolist())
-                    edited_ids = set(edited_df['ID'].tolist())
-                    deleted_ids = original_ids - edited_ids
+                    # Rows removed in the editor (in original but not in edited)
+                    deleted_ids = [
+                        int(schema_id) for schema_id in edit_df.loc[~edit_df['ID'].isin(edited_df['ID']), 'ID']
+                    ]
                     
-                    if deleted_ids:
-                        for schema_id in deleted_ids:
-                            delete_query = f"""
-                                UPDATE {DB_SILVER}.target_schemas
-                                SET active = FALSE,
-                                    updated_timestamp = CURRENT_TIMESTAMP()
-                                WHERE schema_id = {schema_id}
-                            """
-                            execute_query(delete_query)
-                            deletions_made = True
+                    # Added rows have no ID (or one the original never had); skip rows left without a name
+                    is_new = edited_df['ID'].isna() | ~edited_df['ID'].isin(edit_df['ID'])
+                    added_df = edited_df.loc[is_new & edited_df['Column Name'].notna() & (edited_df['Column Name'] != ''), editable_cols]
+                    # Empty cells come back as NaN; bind them as NULL
+                    added_df = added_df.astype(object).where(added_df.notna(), None)
+                    new_columns = [
+                        (
+                            selected_table,
+                            str(column_name).upper(),
+                            data_type or "VARCHAR",
+                            True,
+                            None if default == "(None)" else default or None,
+                            description or None,
+                            st.session_state.selected_tpa
+                        )
+                        for column_name, data_type, default, description in added_df.itertuples(index=False)
+                    ]
                     
-                    # Check for new rows (rows in edited but not in original)
-                    new_ids = edited_ids - original_ids
+                    # Line existing rows up with their originals by ID and compare the editable columns
+                    # in one pass (two missing values count as unchanged)
+                    merged_df = edited_df[~is_new].merge(edit_df, on='ID', suffixes=('', '_old'))
+                    new_values = merged_df[editable_cols].to_numpy()
+                    old_values = merged_df[[f'{col}_old' for col in editable_cols]].to_numpy()
+                    changed = ((new_values != old_values) & ~(pd.isna(new_values) & pd.isna(old_values))).any(axis=1)
+                    changed_df = merged_df.loc[changed, ['ID'] + editable_cols]
+                    changed_df = changed_df.astype(object).where(changed_df.notna(), None)
+                    updated_columns = [
+                        (
+                            int(row_id),
+                            column_name.upper(),
+                            data_type,
+                            None if default == "(None)" else default or None,
+                            description or None
+                        )
+                        for row_id, column_name, data_type, default, description
+                        in changed_df.itertuples(index=False)
+                    ]
                     
-                    # Check for edited and new rows
-                    for idx, row in edited_df.iterrows():
-                        row_id = row['ID']
-                        
-                        # Check if this is a new row (ID not in original or ID is NaN)
-                        if pd.isna(row_id) or row_id not in original_ids:
-                            # This is a new row - insert it
-                            if pd.notna(row.get('Column Name')) and row.get('Column Name'):
-                                processed_default = None if row.get('Default') == "(None)" else row.get('Default')
-                                
-                                insert_query = f"""
-                                    INSERT INTO {DB_SILVER}.target_schemas (
-                                        table_name, column_name, data_type, nullable,
-                                        default_value, description, active, tpa
-                                    )
-                                    VALUES (
-                                        '{selected_table}',
-                                        '{str(row["Column Name"]).upper()}',
-                                        '{row.get("Data Type", "VARCHAR")}',
-                                        TRUE,
-                                        {f"'{processed_default}'" if processed_default else 'NULL'},
-                                        {f"'{row.get('Description', '')}'" if row.get('Description') else 'NULL'},
-                                        TRUE,
-                                        '{st.session_state.selected_tpa}'
-                                    )
-                                """
-                                execute_query(insert_query)
-                                additions_made = True
-                        else:
-                            # Find matching original row by ID
-                            original_row = edit_df[edit_df['ID'] == row_id]
-                            if not original_row.empty:
-                                original_row = original_row.iloc[0]
-                                # Compare only the editable columns individually
-                                editable_cols = ['Column Name', 'Data Type', 'Default', 'Description']
-                                
-                                # Check if any column has changed
-                                has_changes = False
-                                for col in editable_cols:
-                                    orig_val = original_row[col]
-                                    new_val = row[col]
-                                    # Handle NaN comparisons
-                                    if pd.isna(orig_val) and pd.isna(new_val):
-                                        continue
-                                    if orig_val != new_val:
-                                        has_changes = True
-                                        break
-                                
-                                if has_changes:
-                                    new_default = row['Default'] if row['Default'] != "(None)" else None
-                                    
-                                    update_query = f"""
-                                        UPDATE {DB_SILVER}.target_schemas
-                                        SET column_name = '{row["Column Name"].upper()}',
-                                            data_type = '{row["Data Type"]}',
-                                            nullable = TRUE,
-                                            default_value = {f"'{new_default}'" if new_default else 'NULL'},
-                                            description = {f"'{row['Description']}'" if row['Description'] else 'NULL'},
-                                            updated_timestamp = CURRENT_TIMESTAMP()
-                                        WHERE schema_id = {row_id}
-                                    """
-                                    execute_query(update_query)
-                                    changes_made = True
+                    # One statement per kind of change instead of one per row
+                    if deleted_ids:
+                        deactivate_target_columns(deleted_ids)
+                    if new_columns:
+                        insert_target_columns(new_columns)
+                    if updated_columns:
+                        update_target_columns(updated_columns)
                     
-                    if changes_made or deletions_made or additions_made:
+                    if deleted_ids or new_columns or updated_columns:
+                        clear_target_schema_cache()
                         # Automatically sync the physical table with metadata
                         with st.spinner(f"Syncing {selected_table} with database..."):
-                            result = execute_procedure(f"CALL {DB_SILVER}.sync_table_with_metadata('{selected_table}')")
+                            result = execute_procedure(f"{DB_SILVER}.sync_table_with_metadata", selected_table)
                             if "Successfully" in result or "Recreated" in result:
                                 st.success(f"✅ Changes saved and table synced! {result}")
                             else:
                                 st.warning(f"⚠️ Changes saved to metadata, but table sync had issues: {result}")
-                        st.rerun()
+                        st.rerun(scope="fragment")
                     else:
                         st.info("No changes detected")
         
         else:
             st.info("👈 Select a table from the list or click '➕ New Table' to get started.")
 
+if page == "📐 Target Table Designer":
+    render_target_table_designer()
+
 # ============================================
 # PAGE: FIELD MAPPER
 # ============================================
@@ -982,7 +1044,6 @@ if page == "🗺️ Field Mapper":
                         
                         if approved_changed or transformation_changed or description_changed:
                             # Properly escape single quotes in strings
-                            import pandas as pd
                             transformation_logic = edited_row.get('TRANSFORMATION_LOGIC', '')
                             description = edited_row.get('DESCRIPTION', '')
                             
@@ -1224,7 +1285,8 @@ if page == "🗺️ Field Mapper":
                 else:
                     with st.spinner(f"Analyzing fields and generating mappings for {target_table_ml}..."):
                         result = execute_procedure(
-                            f"CALL {DB_SILVER}.auto_map_fields_ml('DB_INGEST_PIPELINE.BRONZE.RAW_DATA_TABLE', '{target_table_ml}', {top_n}, {min_confidence}, '{st.session_state.selected_tpa}')"
+                            f"{DB_SILVER}.auto_map_fields_ml", 'DB_INGEST_PIPELINE.BRONZE.RAW_DATA_TABLE',
+                            target_table_ml, top_n, min_confidence, st.session_state.selected_tpa
                         )
                         st.info(result)
                     
@@ -1284,7 +1346,8 @@ if page == "🗺️ Field Mapper":
                 else:
                     with st.spinner(f"Calling {model_name} for semantic mapping to {target_table_llm}..."):
                         result = execute_procedure(
-                            f"CALL {DB_SILVER}.auto_map_fields_llm('DB_INGEST_PIPELINE.BRONZE.RAW_DATA_TABLE', '{target_table_llm}', '{model_name}', '{prompt_id}', '{st.session_state.selected_tpa}')"
+                            f"{DB_SILVER}.auto_map_fields_llm", 'DB_INGEST_PIPELINE.BRONZE.RAW_DATA_TABLE',
+                            target_table_llm, model_name, prompt_id, st.session_state.selected_tpa
                         )
                         st.info(result)
                     
@@ -2608,8 +2671,8 @@ if page == "📊 Transformation Monitor":
             else:
                 with st.spinner(f"Transforming data to {target_table_transform}..."):
                     result = execute_procedure(
-                        f"CALL {DB_SILVER}.transform_bronze_to_silver('RAW_DATA_TABLE', '{target_table_transform}', "
-                        f"'{BRONZE_SCHEMA}', {batch_size}, {apply_rules}, TRUE)"
+                        f"{DB_SILVER}.transform_bronze_to_silver", 'RAW_DATA_TABLE', target_table_transform,
+                        BRONZE_SCHEMA, batch_size, apply_rules, True
                     )
                     st.info(result)
                     st.rerun()
@@ -2711,7 +2774,7 @@ if page == "📋 Data Viewer":
                 if not last_update_df.empty:
                     time_col = last_update_df['COLUMN_NAME'][0]
                     max_time_df = execute_query(f"SELECT MAX({time_col}) as max_time FROM {DB_SILVER}.{selected_table}", show_error=False)
-                    if not max_time_df.empty and max_time_df['MAX_TIME'][0] is not None:
+                    if not max_time_df.empty and pd.notna(max_time_df['MAX_TIME'][0]):
                         col4.metric("Latest Record", str(max_time_df['MAX_TIME'][0])[:10])
                 
                 st.markdown("---")
@@ -2958,13 +3021,13 @@ if page == "🔧 Task Management":
     
     with col1:
         if st.button("▶️ Resume All Tasks"):
-            result = execute_procedure(f"CALL {DB_SILVER}.resume_all_silver_tasks()")
+            result = execute_procedure(f"{DB_SILVER}.resume_all_silver_tasks")
             st.success(result)
             st.rerun()
     
     with col2:
         if st.button("⏸️ Suspend All Tasks"):
-            result = execute_procedure(f"CALL {DB_SILVER}.suspend_all_silver_tasks()")
+            result = execute_procedure(f"{DB_SILVER}.suspend_all_silver_tasks")
             st.success(result)
             st.rerun()
     